@@ -2,6 +2,16 @@ from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import random
 
+# Fast non-cryptographic hash for cache keys; xxh3 is ~10x faster than
+# blake2b on short inputs, which matters on the cache-hit fast path.
+try:
+    import xxhash
+    _hash = lambda b: xxhash.xxh3_64_hexdigest(b)
+except ImportError:
+    import hashlib
+    _hash = lambda b: hashlib.blake2b(b, digest_size=8).hexdigest()
+
+
 class PromptEvaluator:
     """
     Evaluates prompt performance using test cases.
@@ -12,6 +22,7 @@ class PromptEvaluator:
         """Initialize prompt evaluator."""
         self.test_cases: List[Dict[str, Any]] = []
         self.evaluation_history: List[Dict[str, Any]] = []
+        self._eval_cache: Dict[str, Dict[str, Any]] = {}
     
     def add_test_case(self, 
                       test_id: str,
@@ -35,59 +46,80 @@ class PromptEvaluator:
         }
         self.test_cases.append(test_case)
     
-    def evaluate_prompt(self, 
+    def evaluate_prompt(self,
                        prompt: str,
-                       agent_response_func=None) -> Dict[str, Any]:
+                       agent_response_func=None,
+                       staged: bool = True,
+                       stage1_quality_floor: float = 0.2) -> Dict[str, Any]:
         """
         Evaluate a prompt using test cases.
-        
+
+        Uses staged evaluation: a cheap first pass runs only the first test
+        case, and if quality falls below stage1_quality_floor the remaining
+        tests are skipped. Most mutated prompts in a GA population score
+        poorly, so this avoids running the full suite on broken mutations.
+
         Args:
             prompt: Prompt to evaluate
             agent_response_func: Function that generates response given prompt & input
-            
+            staged: Run a single-test quick prune before the full suite
+            stage1_quality_floor: Minimum quality on the first test to
+                continue to the remaining tests
+
         Returns:
             Evaluation report with fitness score
         """
+        # Memoize by prompt content: GA populations re-evaluate identical
+        # prompts (elites, duplicate offspring) across generations.
+        cache_key = None
+        if agent_response_func is None:
+            cache_key = _hash(prompt.encode()) + str(len(self.test_cases)) + str(staged)
+            cached = self._eval_cache.get(cache_key)
+            if cached is not None:
+                self.evaluation_history.append(cached)
+                return cached
+
         results = []
         quality_scores = []
         speed_scores = []
         consistency_scores = []
-        
-        # Test against all test cases
-        for test_case in self.test_cases:
-            # Simulate agent response (in real system, call actual agent)
-            if agent_response_func:
-                import time
-                start_time = time.time()
-                response = agent_response_func(prompt, test_case["input"])
-                response_time = (time.time() - start_time) * 1000  # ms
-            else:
-                # Placeholder simulation
-                response = self._simulate_response(prompt, test_case["input"])
-                response_time = random.uniform(800, 3000)
-            
-            # Quality score (how well does it match expected output?)
-            quality_score = self._calculate_quality_score(
-                response, 
-                test_case["expected"]
-            )
-            quality_scores.append(quality_score)
-            
-            # Speed score (response time performance)
-            speed_score = self._calculate_speed_score(response_time)
-            speed_scores.append(speed_score)
-            
-            # Consistency score (determinism)
-            consistency_score = self._calculate_consistency_score(prompt, response)
-            consistency_scores.append(consistency_score)
-            
-            results.append({
-                "test_id": test_case["test_id"],
-                "quality": quality_score,
-                "speed_ms": response_time,
-                "consistency": consistency_score
-            })
-        
+
+        # Stage 1: quick prune on a single representative test
+        if staged and len(self.test_cases) > 1:
+            result = self._run_test_case(prompt, self.test_cases[0], agent_response_func)
+            quality_scores.append(result["quality"])
+            speed_scores.append(self._calculate_speed_score(result["speed_ms"]))
+            consistency_scores.append(result["consistency"])
+            results.append(result)
+
+            if result["quality"] < stage1_quality_floor:
+                # Broken mutation: skip the full suite
+                evaluation = self._build_evaluation(
+                    prompt,
+                    results,
+                    avg_quality=result["quality"],
+                    avg_speed=self._calculate_speed_score(result["speed_ms"]),
+                    avg_consistency=result["consistency"],
+                    fitness_score=result["quality"] * 0.5,
+                    short_circuited=True
+                )
+                if cache_key is not None:
+                    self._eval_cache[cache_key] = evaluation
+                self.evaluation_history.append(evaluation)
+                return evaluation
+
+            remaining_cases = self.test_cases[1:]
+        else:
+            remaining_cases = self.test_cases
+
+        # Stage 2: test against remaining test cases
+        for test_case in remaining_cases:
+            result = self._run_test_case(prompt, test_case, agent_response_func)
+            quality_scores.append(result["quality"])
+            speed_scores.append(self._calculate_speed_score(result["speed_ms"]))
+            consistency_scores.append(result["consistency"])
+            results.append(result)
+
         # Calculate average scores
         avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
         avg_speed = sum(speed_scores) / len(speed_scores) if speed_scores else 0
@@ -95,8 +127,55 @@ class PromptEvaluator:
         
         # Combined fitness
         fitness_score = (avg_quality * 0.5) + (avg_speed * 0.2) + (avg_consistency * 0.3)
-        
-        evaluation = {
+
+        evaluation = self._build_evaluation(
+            prompt,
+            results,
+            avg_quality=avg_quality,
+            avg_speed=avg_speed,
+            avg_consistency=avg_consistency,
+            fitness_score=fitness_score
+        )
+
+        if cache_key is not None:
+            self._eval_cache[cache_key] = evaluation
+        self.evaluation_history.append(evaluation)
+
+        return evaluation
+
+    def _run_test_case(self,
+                       prompt: str,
+                       test_case: Dict[str, Any],
+                       agent_response_func=None) -> Dict[str, Any]:
+        """Run a single test case and score the response."""
+        # Simulate agent response (in real system, call actual agent)
+        if agent_response_func:
+            import time
+            start_time = time.time()
+            response = agent_response_func(prompt, test_case["input"])
+            response_time = (time.time() - start_time) * 1000  # ms
+        else:
+            # Placeholder simulation
+            response = self._simulate_response(prompt, test_case["input"])
+            response_time = random.uniform(800, 3000)
+
+        return {
+            "test_id": test_case["test_id"],
+            "quality": self._calculate_quality_score(response, test_case["expected"]),
+            "speed_ms": response_time,
+            "consistency": self._calculate_consistency_score(prompt, response)
+        }
+
+    def _build_evaluation(self,
+                          prompt: str,
+                          results: List[Dict[str, Any]],
+                          avg_quality: float,
+                          avg_speed: float,
+                          avg_consistency: float,
+                          fitness_score: float,
+                          short_circuited: bool = False) -> Dict[str, Any]:
+        """Build the evaluation report dict."""
+        return {
             "prompt": prompt[:100] + "..." if len(prompt) > 100 else prompt,
             "timestamp": datetime.now().isoformat(),
             "test_results": results,
@@ -107,13 +186,10 @@ class PromptEvaluator:
             },
             "fitness_score": round(fitness_score, 3),
             "tests_passed": sum(1 for r in results if r["quality"] > 0.7),
-            "total_tests": len(results)
+            "total_tests": len(results),
+            "short_circuited": short_circuited
         }
-        
-        self.evaluation_history.append(evaluation)
-        
-        return evaluation
-    
+
     def _calculate_quality_score(self, response: str, expected: str) -> float:
         """Calculate quality score based on response correctness."""
         if not response or not expected:
@@ -152,9 +228,11 @@ class PromptEvaluator:
     
     def _calculate_consistency_score(self, prompt: str, response: str) -> float:
         """Calculate consistency score."""
-        # In real system, would test prompt multiple times with same input
-        # For now, return high score (would be deterministic in production)
-        return random.uniform(0.8, 1.0)
+        # TODO: real implementation should invoke the prompt repeatedly with
+        # the same input and measure response variance.
+        # Deterministic placeholder: identical prompts must yield identical
+        # scores or the evaluation cache returns stale-looking results.
+        return 0.9
     
     def _simulate_response(self, prompt: str, input_text: str) -> str:
         """Simulate agent response for testing."""
@@ -178,17 +256,17 @@ class PromptEvaluator:
     
     def _calculate_improvement_trend(self) -> float:
         """Calculate fitness improvement trend."""
-        if len(self.evaluation_history) < 2:
+        history = self.evaluation_history
+        n = len(history)
+        if n < 2:
             return 0.0
-        
-        first_half_avg = sum(
-            e["fitness_score"] for e in self.evaluation_history[:len(self.evaluation_history)//2]
-        ) / (len(self.evaluation_history) // 2)
-        
-        second_half_avg = sum(
-            e["fitness_score"] for e in self.evaluation_history[len(self.evaluation_history)//2:]
-        ) / (len(self.evaluation_history) - len(self.evaluation_history)//2)
-        
+
+        mid = n // 2
+        scores = [e["fitness_score"] for e in history]
+
+        first_half_avg = sum(scores[:mid]) / mid
+        second_half_avg = sum(scores[mid:]) / (n - mid)
+
         return second_half_avg - first_half_avg
 
 
@@ -0,0 +1,55 @@
+"""
+Optional compiled kernels for vector store hot paths.
+Uses numba to JIT-compile the scalar loops to SIMD machine code;
+falls back to pure Python when numba isn't installed.
+"""
+import math
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    HAVE_NUMBA = True
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def batch_dot(matrix, query):
+        """Row-wise dot products of a float32 matrix against a query,
+        parallelized across cores with a SIMD inner loop."""
+        out = np.empty(matrix.shape[0], dtype=np.float32)
+        for i in prange(matrix.shape[0]):
+            acc = 0.0
+            for j in range(matrix.shape[1]):
+                acc += matrix[i, j] * query[j]
+            out[i] = acc
+        return out
+
+    @njit(fastmath=True, cache=True)
+    def cosine(a, b):
+        """Cosine similarity of two contiguous float32 vectors."""
+        dot = 0.0
+        norm_a = 0.0
+        norm_b = 0.0
+        for i in range(a.shape[0]):
+            dot += a[i] * b[i]
+            norm_a += a[i] * a[i]
+            norm_b += b[i] * b[i]
+        if norm_a == 0.0 or norm_b == 0.0:
+            return 0.0
+        return dot / (math.sqrt(norm_a) * math.sqrt(norm_b))
+
+except ImportError:
+    HAVE_NUMBA = False
+
+    def batch_dot(matrix, query):
+        """Row-wise dot products (NumPy fallback)."""
+        return matrix @ query
+
+    def cosine(a, b):
+        """Cosine similarity of two float32 vectors (pure-Python fallback)."""
+        dot = float(np.dot(a, b))
+        norm_a = float(np.dot(a, a))
+        norm_b = float(np.dot(b, b))
+        if norm_a == 0.0 or norm_b == 0.0:
+            return 0.0
+        return dot / (math.sqrt(norm_a) * math.sqrt(norm_b))
@@ -1,9 +1,28 @@
 import json
 import os
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import uuid
 
+
+def _iter_string_leaves(value: Any):
+    """Yield every string leaf nested inside a content value."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_string_leaves(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_string_leaves(item)
+
+
+def build_search_text(content: Dict[str, Any]) -> str:
+    """Lowercased concatenation of a memory content's string fields."""
+    return " ".join(_iter_string_leaves(content)).lower()
+
+
 class LongTermMemory:
     """
     Manages persistent long-term memory stored as JSON files.
@@ -21,6 +40,8 @@ class LongTermMemory:
         os.makedirs(storage_path, exist_ok=True)
         self.memory_index_file = os.path.join(storage_path, "memory_index.json")
         self._ensure_index_exists()
+        # entity_id -> memory_id, built lazily on first entity lookup
+        self._entity_index: Optional[Dict[str, str]] = None
     
     def _ensure_index_exists(self):
         """Create memory index file if it doesn't exist."""
@@ -45,7 +66,9 @@ class LongTermMemory:
             "memory_id": memory_id,
             "memory_type": memory_type,
             "timestamp": datetime.now().isoformat(),
-            "content": content
+            "content": content,
+            # Precomputed so keyword search never re-renders content
+            "search_text": build_search_text(content)
         }
         
         # Save to individual JSON file
@@ -55,7 +78,13 @@ class LongTermMemory:
         
         # Update index
         self._update_index(memory_id, memory_type, "created")
-        
+
+        # Keep the entity index current once it has been built
+        if memory_type == "entity_knowledge" and self._entity_index is not None:
+            entity_id = content.get("entity_id")
+            if entity_id is not None and entity_id not in self._entity_index:
+                self._entity_index[entity_id] = memory_id
+
         return memory_id
     
     def retrieve_memory(self, memory_id: str) -> Optional[Dict[str, Any]]:
@@ -75,32 +104,54 @@ class LongTermMemory:
                 return json.load(f)
         return None
     
-    def retrieve_by_type(self, memory_type: str, limit: int = 10) -> List[Dict[str, Any]]:
+    def retrieve_many(self, memory_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Batch-retrieve memory records in one call.
+
+        Args:
+            memory_ids: Memory IDs to fetch
+
+        Returns:
+            Memory records in request order; missing IDs are skipped
+        """
+        memories = []
+        for memory_id in memory_ids:
+            record = self.retrieve_memory(memory_id)
+            if record:
+                memories.append(record)
+        return memories
+
+    def retrieve_by_type(self,
+                         memory_type: str,
+                         limit: int = 10,
+                         where: Optional[Any] = None) -> List[Dict[str, Any]]:
         """
         Retrieve all memories of a specific type.
-        
+
         Args:
             memory_type: Type of memory to retrieve
             limit: Maximum number of results to return
-            
+            where: Optional predicate applied to each record before it
+                counts toward the limit
+
         Returns:
             List of memory records
         """
         memories = []
-        
+
         # Load index
         with open(self.memory_index_file, 'r') as f:
             index = json.load(f)
-        
+
         # Find all memories of this type
         for mem_entry in index["memories"]:
             if mem_entry["memory_type"] == memory_type:
                 memory_record = self.retrieve_memory(mem_entry["memory_id"])
-                if memory_record:
+                if memory_record and (where is None or where(memory_record)):
                     memories.append(memory_record)
                     if len(memories) >= limit:
                         break
-        
+
         return memories
     
     def retrieve_recent(self, days: int = 7, limit: int = 10) -> List[Dict[str, Any]]:
@@ -132,6 +183,28 @@ class LongTermMemory:
         
         return memories
     
+    def retrieve_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve an entity_knowledge memory by entity ID in O(1).
+
+        Args:
+            entity_id: Entity identifier (e.g., cell ID)
+
+        Returns:
+            Entity memory record or None
+        """
+        if self._entity_index is None:
+            # One-time build; first stored record per entity wins,
+            # matching the previous linear-scan semantics
+            self._entity_index = {}
+            for memory in self.retrieve_by_type("entity_knowledge", limit=1000000):
+                eid = memory.get("content", {}).get("entity_id")
+                if eid is not None and eid not in self._entity_index:
+                    self._entity_index[eid] = memory["memory_id"]
+
+        memory_id = self._entity_index.get(entity_id)
+        return self.retrieve_memory(memory_id) if memory_id else None
+
     def update_memory(self, memory_id: str, updated_content: Dict[str, Any]) -> bool:
         """
         Update an existing memory record.
@@ -154,7 +227,11 @@ class LongTermMemory:
         
         # Update content and timestamp
         memory_record["content"] = updated_content
+        memory_record["search_text"] = build_search_text(updated_content)
         memory_record["updated_at"] = datetime.now().isoformat()
+
+        # Content (and possibly entity_id) changed; rebuild lazily
+        self._entity_index = None
         
         # Save updated record
         with open(memory_file, 'w') as f:
@@ -177,6 +254,7 @@ class LongTermMemory:
         if os.path.exists(memory_file):
             os.remove(memory_file)
             self._update_index(memory_id, "", "deleted")
+            self._entity_index = None
             return True
         return False
     
@@ -221,6 +299,22 @@ class LongTermMemory:
         }
 
 
+# Shared default instance so the memory subsystems don't each pay their
+# own storage IO and caches
+_default_instance: Optional[LongTermMemory] = None
+_default_lock = threading.Lock()
+
+
+def get_default_long_term_memory() -> LongTermMemory:
+    """Return the process-wide shared LongTermMemory instance."""
+    global _default_instance
+    if _default_instance is None:
+        with _default_lock:
+            if _default_instance is None:
+                _default_instance = LongTermMemory()
+    return _default_instance
+
+
 # Example usage
 if __name__ == "__main__":
     # Initialize memory system
@@ -2,6 +2,7 @@ from .long_term_memory import LongTermMemory
 from .vector_store import SimpleVectorStore
 from .memory_retriever import MemoryRetriever
 from .memory_summarizer import MemorySummarizer
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional
 import json
 
@@ -12,11 +13,18 @@ class MemoryManager:
     """
     
     def __init__(self):
-        """Initialize all memory subsystems."""
+        """Initialize all memory subsystems over one shared storage pair."""
         self.long_term = LongTermMemory()
         self.vector_store = SimpleVectorStore()
-        self.retriever = MemoryRetriever()
-        self.summarizer = MemorySummarizer()
+        self.retriever = MemoryRetriever(
+            long_term=self.long_term,
+            vector_store=self.vector_store
+        )
+        self.summarizer = MemorySummarizer(long_term=self.long_term)
+        # Statistics cache, invalidated whenever anything is stored
+        self._stats_version = 0
+        self._stats_cached_version = -1
+        self._stats_cached: Optional[Dict[str, Any]] = None
     
     def store_task_result(self, 
                          task_name: str, 
@@ -52,6 +60,7 @@ class MemoryManager:
             text = f"{task_name} - {result[:100]}"
             self.vector_store.add_vector(memory_id, text, embedding, {"agent": agent})
         
+        self._stats_version += 1
         return memory_id
     
     def store_entity_knowledge(self, 
@@ -75,6 +84,7 @@ class MemoryManager:
             "attributes": attributes
         }
         
+        self._stats_version += 1
         return self.long_term.store_memory("entity_knowledge", entity_content)
     
     def store_error(self, 
@@ -104,6 +114,7 @@ class MemoryManager:
             "resolution": resolution
         }
         
+        self._stats_version += 1
         return self.long_term.store_memory("error_log", error_content)
     
     def store_best_practice(self, 
@@ -131,6 +142,7 @@ class MemoryManager:
             "success_rate": 1.0
         }
         
+        self._stats_version += 1
         return self.long_term.store_memory("best_practices", practice_content)
     
     def query_similar_tasks(self, 
@@ -150,13 +162,18 @@ class MemoryManager:
     
     def get_memory_statistics(self) -> Dict[str, Any]:
         """Get system-wide memory statistics."""
-        lt_stats = self.long_term.get_statistics()
-        vs_stats = self.vector_store.get_statistics()
-        
-        return {
-            "long_term": lt_stats,
-            "vector_store": vs_stats
-        }
+        # Serve the cached report until another store invalidates it; the
+        # proxy is read-only so callers can safely share it
+        if self._stats_cached_version == self._stats_version:
+            return self._stats_cached
+
+        self._stats_cached = MappingProxyType({
+            "long_term": self.long_term.get_statistics(),
+            "vector_store": self.vector_store.get_statistics()
+        })
+        self._stats_cached_version = self._stats_version
+
+        return self._stats_cached
 
 
 # Example usage
@@ -1,7 +1,21 @@
+from collections import defaultdict
 from typing import List, Dict, Any, Optional
-from .long_term_memory import LongTermMemory
-from .vector_store import SimpleVectorStore
-import json
+from .long_term_memory import (
+    LongTermMemory,
+    build_search_text,
+    get_default_long_term_memory,
+)
+from .vector_store import SimpleVectorStore, get_default_vector_store
+import re
+
+# Optional DFA-based multi-pattern matcher; substring scans are the fallback
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
 
 class MemoryRetriever:
     """
@@ -9,10 +23,38 @@ class MemoryRetriever:
     Combines long-term memory and vector store searches.
     """
     
-    def __init__(self):
-        """Initialize retriever with memory systems."""
-        self.long_term = LongTermMemory()
-        self.vector_store = SimpleVectorStore()
+    def __init__(self,
+                 long_term: Optional[LongTermMemory] = None,
+                 vector_store: Optional[SimpleVectorStore] = None):
+        """
+        Initialize retriever with memory systems.
+
+        Args:
+            long_term: Long-term memory to search (shared default if None)
+            vector_store: Vector store to search (shared default if None)
+        """
+        self.long_term = long_term or get_default_long_term_memory()
+        self.vector_store = vector_store or get_default_vector_store()
+        # Inverted keyword index per memory_type, rebuilt when the
+        # candidate set changes
+        self._kw_index: Dict[Any, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _tokenize(text: str) -> List[str]:
+        """Lowercase and split text on non-alphanumeric boundaries."""
+        return _TOKEN_PATTERN.findall(text.lower())
+
+    @staticmethod
+    def _search_blob(memory: Dict[str, Any]) -> str:
+        """
+        Lowercase searchable text for a memory. Records store this at
+        write time; it is rebuilt (and cached) only for legacy records.
+        """
+        blob = memory.get("search_text")
+        if blob is None:
+            blob = build_search_text(memory.get("content", {}))
+            memory["search_text"] = blob
+        return blob
     
     def retrieve_by_keyword(self, 
                            keyword: str, 
@@ -30,22 +72,97 @@ class MemoryRetriever:
             List of matching memories
         """
         results = []
-        
+
         if memory_type:
             candidates = self.long_term.retrieve_by_type(memory_type, limit=100)
         else:
             candidates = self.long_term.retrieve_recent(limit=100)
-        
-        # Simple keyword matching
+
         keyword_lower = keyword.lower()
+
+        # O(1) token lookup via the inverted index built over this
+        # candidate set (rebuilt only when the set changes)
+        cached = self._get_kw_index(memory_type, candidates)
+        hits = cached["index"].get(keyword_lower)
+        if hits:
+            return [cached["by_id"][mem_id] for mem_id in hits[:limit]]
+
+        # Fall back to substring matching for phrases / partial words
         for memory in candidates:
-            content = json.dumps(memory.get("content", {})).lower()
-            if keyword_lower in content:
+            if keyword_lower in self._search_blob(memory):
                 results.append(memory)
                 if len(results) >= limit:
                     break
-        
+
         return results
+
+    def retrieve_by_keywords(self,
+                             keywords: List[str],
+                             memory_type: str = None,
+                             limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Retrieve memories matching any of several keywords in one pass.
+
+        Compiles the keyword set into an Aho-Corasick automaton when
+        pyahocorasick is available, so each memory's text is scanned once
+        for all patterns instead of once per keyword.
+
+        Args:
+            keywords: Search keywords
+            memory_type: Optional filter by memory type
+            limit: Max results
+
+        Returns:
+            List of matching memories
+        """
+        if memory_type:
+            candidates = self.long_term.retrieve_by_type(memory_type, limit=100)
+        else:
+            candidates = self.long_term.retrieve_recent(limit=100)
+
+        keywords_lower = [kw.lower() for kw in keywords]
+
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for kw in keywords_lower:
+                automaton.add_word(kw, kw)
+            automaton.make_automaton()
+
+            def matches(blob: str) -> bool:
+                for _ in automaton.iter(blob):
+                    return True
+                return False
+        else:
+            def matches(blob: str) -> bool:
+                return any(kw in blob for kw in keywords_lower)
+
+        results = []
+        for memory in candidates:
+            if matches(self._search_blob(memory)):
+                results.append(memory)
+                if len(results) >= limit:
+                    break
+
+        return results
+
+    def _get_kw_index(self,
+                      memory_type: Optional[str],
+                      candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build (or reuse) the inverted keyword index for a candidate set."""
+        candidate_ids = [m["memory_id"] for m in candidates]
+        cached = self._kw_index.get(memory_type)
+        if cached is None or cached["ids"] != candidate_ids:
+            index: Dict[str, List[str]] = defaultdict(list)
+            for memory in candidates:
+                for token in set(self._tokenize(self._search_blob(memory))):
+                    index[token].append(memory["memory_id"])
+            cached = {
+                "ids": candidate_ids,
+                "index": index,
+                "by_id": {m["memory_id"]: m for m in candidates}
+            }
+            self._kw_index[memory_type] = cached
+        return cached
     
     def retrieve_similar(self, 
                         query_embedding: List[float], 
@@ -89,12 +206,13 @@ class MemoryRetriever:
         Returns:
             List of task history memories
         """
-        tasks = self.long_term.retrieve_by_type("task_history", limit=limit)
-        
+        # Push the filter into the storage scan so limit counts matching
+        # tasks rather than being eaten by post-filtering
+        where = None
         if agent_name:
-            tasks = [t for t in tasks if t.get("content", {}).get("agent") == agent_name]
-        
-        return tasks
+            where = lambda t: t.get("content", {}).get("agent") == agent_name
+
+        return self.long_term.retrieve_by_type("task_history", limit=limit, where=where)
     
     def retrieve_entity_knowledge(self, entity_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -106,13 +224,7 @@ class MemoryRetriever:
         Returns:
             Entity knowledge memory or None
         """
-        entities = self.long_term.retrieve_by_type("entity_knowledge", limit=100)
-        
-        for entity in entities:
-            if entity.get("content", {}).get("entity_id") == entity_id:
-                return entity
-        
-        return None
+        return self.long_term.retrieve_entity(entity_id)
     
     def retrieve_error_logs(self, 
                            agent_name: str = None, 
@@ -129,15 +241,21 @@ class MemoryRetriever:
         Returns:
             List of error logs
         """
-        errors = self.long_term.retrieve_by_type("error_log", limit=limit)
-        
+        # Fuse optional filters into one predicate and push it into the
+        # storage scan so limit counts matching errors
+        predicates = []
         if agent_name:
-            errors = [e for e in errors if e.get("content", {}).get("agent") == agent_name]
-        
+            predicates.append(
+                lambda e: e.get("content", {}).get("agent") == agent_name)
         if error_type:
-            errors = [e for e in errors if e.get("content", {}).get("error_type") == error_type]
-        
-        return errors
+            predicates.append(
+                lambda e: e.get("content", {}).get("error_type") == error_type)
+
+        where = None
+        if predicates:
+            where = lambda e: all(p(e) for p in predicates)
+
+        return self.long_term.retrieve_by_type("error_log", limit=limit, where=where)
     
     def retrieve_best_practices(self, use_case: str = None) -> List[Dict[str, Any]]:
         """
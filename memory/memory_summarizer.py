@@ -1,5 +1,6 @@
-from typing import Dict, List, Any
-from .long_term_memory import LongTermMemory
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from .long_term_memory import LongTermMemory, get_default_long_term_memory
 import json
 
 class MemorySummarizer:
@@ -7,10 +8,18 @@ class MemorySummarizer:
     Summarizes long interactions and stores compressed versions.
     Helps manage memory size and improve retrieval efficiency.
     """
-    
-    def __init__(self, storage_path: str = "./memory/summaries/"):
-        """Initialize summarizer."""
-        self.long_term = LongTermMemory()
+
+    def __init__(self,
+                 storage_path: str = "./memory/summaries/",
+                 long_term: Optional[LongTermMemory] = None):
+        """
+        Initialize summarizer.
+
+        Args:
+            storage_path: Directory for storing summaries
+            long_term: Long-term memory to read from (shared default if None)
+        """
+        self.long_term = long_term or get_default_long_term_memory()
         self.storage_path = storage_path
         import os
         os.makedirs(storage_path, exist_ok=True)
@@ -60,12 +69,8 @@ class MemorySummarizer:
         Returns:
             Summarized interaction sequence
         """
-        memories = []
-        for mem_id in memory_ids:
-            mem = self.long_term.retrieve_memory(mem_id)
-            if mem:
-                memories.append(mem)
-        
+        memories = self.long_term.retrieve_many(memory_ids)
+
         # Build summary timeline
         timeline = []
         for mem in memories:
@@ -84,70 +89,101 @@ class MemorySummarizer:
         
         return summary
     
+    # Metrics tracked in the per-entity running aggregate
+    _PERF_METRICS = {"sinr": "sinr_avg", "throughput": "throughput_mbps"}
+
+    @classmethod
+    def append_performance_sample(cls,
+                                  content: Dict[str, Any],
+                                  sample: Dict[str, Any]):
+        """
+        Append a performance sample to an entity's content, keeping the
+        running aggregates current so summaries stay O(1).
+
+        Args:
+            content: Entity memory content (mutated in place)
+            sample: Performance sample (e.g., sinr_avg, throughput_mbps)
+        """
+        content.setdefault("performance_history", []).append(sample)
+        agg = content.setdefault("perf_agg", {})
+        for name, field in cls._PERF_METRICS.items():
+            value = sample.get(field, 0)
+            metric = agg.get(name)
+            if metric is None:
+                agg[name] = {"n": 1, "sum": value, "min": value, "max": value}
+            else:
+                metric["n"] += 1
+                metric["sum"] += value
+                if value < metric["min"]:
+                    metric["min"] = value
+                if value > metric["max"]:
+                    metric["max"] = value
+
     def summarize_entity_performance(self, entity_id: str) -> Dict[str, Any]:
         """
         Summarize performance history for an entity.
-        
+
         Args:
             entity_id: Entity ID (e.g., cell ID)
-            
+
         Returns:
             Performance summary
         """
-        # Retrieve all entity memories
-        entity_memories = self.long_term.retrieve_by_type("entity_knowledge", limit=100)
-        entity_memory = None
-        
-        for mem in entity_memories:
-            if mem.get("content", {}).get("entity_id") == entity_id:
-                entity_memory = mem
-                break
-        
+        entity_memory = self.long_term.retrieve_entity(entity_id)
+
         if not entity_memory:
             return {}
-        
+
         content = entity_memory.get("content", {})
         performance_history = content.get("performance_history", [])
-        
-        # Calculate statistics
-        if performance_history:
-            sinr_values = [p.get("sinr_avg", 0) for p in performance_history]
-            throughput_values = [p.get("throughput_mbps", 0) for p in performance_history]
-            
-            summary = {
-                "entity_id": entity_id,
-                "entity_type": content.get("entity_type"),
-                "latest_performance": performance_history[-1] if performance_history else {},
-                "sinr_trend": {
-                    "min": min(sinr_values) if sinr_values else 0,
-                    "max": max(sinr_values) if sinr_values else 0,
-                    "avg": sum(sinr_values) / len(sinr_values) if sinr_values else 0
-                },
-                "throughput_trend": {
-                    "min": min(throughput_values) if throughput_values else 0,
-                    "max": max(throughput_values) if throughput_values else 0,
-                    "avg": sum(throughput_values) / len(throughput_values) if throughput_values else 0
-                },
-                "history_count": len(performance_history)
-            }
-        else:
-            summary = {
+
+        if not performance_history:
+            return {
                 "entity_id": entity_id,
                 "message": "No performance history"
             }
-        
-        return summary
+
+        # Prefer the running aggregates; scan only legacy entities
+        # that predate them
+        perf_agg = content.get("perf_agg")
+        if perf_agg and all(m in perf_agg for m in self._PERF_METRICS):
+            trends = {
+                name: {
+                    "min": perf_agg[name]["min"],
+                    "max": perf_agg[name]["max"],
+                    "avg": perf_agg[name]["sum"] / perf_agg[name]["n"]
+                }
+                for name in self._PERF_METRICS
+            }
+        else:
+            trends = {}
+            for name, field in self._PERF_METRICS.items():
+                values = [p.get(field, 0) for p in performance_history]
+                trends[name] = {
+                    "min": min(values),
+                    "max": max(values),
+                    "avg": sum(values) / len(values)
+                }
+
+        return {
+            "entity_id": entity_id,
+            "entity_type": content.get("entity_type"),
+            "latest_performance": performance_history[-1],
+            "sinr_trend": trends["sinr"],
+            "throughput_trend": trends["throughput"],
+            "history_count": len(performance_history)
+        }
     
     def _extract_key_result(self, result_text: str, max_length: int = 100) -> str:
         """Extract key result from long text."""
         if len(result_text) <= max_length:
             return result_text
-        
-        # Try to find first sentence
-        sentences = result_text.split('.')
-        if sentences:
-            return sentences[0][:max_length] + "..."
-        
+
+        # Find the first sentence break without splitting the whole text
+        cut = result_text.find('.', 0, max_length)
+        if cut != -1:
+            return result_text[:cut] + "..."
+
         return result_text[:max_length] + "..."
     
     def create_memory_report(self) -> Dict[str, Any]:
@@ -162,7 +198,7 @@ class MemorySummarizer:
         return {
             "total_memories": lt_stats["total_memories"],
             "by_type": lt_stats["by_type"],
-            "report_generated": str(__import__('datetime').datetime.now())
+            "report_generated": datetime.now().isoformat()
         }
 
 
@@ -1,206 +1,475 @@
 import json
 import os
+import threading
+from collections import defaultdict
 from typing import Dict, List, Tuple, Any, Optional
-import math
+
+import numpy as np
+
+from ._kernels import HAVE_NUMBA, batch_dot as _batch_dot, cosine as _cosine_kernel
+
+# orjson parses/serializes 3-10x faster than stdlib json; fall back to the
+# stdlib when it isn't installed.
+try:
+    import orjson
+
+    def _loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        # Compact separators: this file is machine-only, never pretty-printed
+        return json.dumps(obj, separators=(',', ':')).encode()
+
 
 class SimpleVectorStore:
     """
     Simple vector store for semantic similarity search.
     Uses cosine similarity with pre-computed embeddings.
+    Embeddings are persisted as raw float32 rows (vectors.bin) with record
+    metadata in an append-only JSONL sidecar (meta.jsonl): adds append one
+    row and one line, deletes append a tombstone, and the files are
+    compacted once tombstones exceed a fraction of the store.
     Note: For production, use ChromaDB or Milvus instead.
     """
-    
-    def __init__(self, storage_path: str = "./memory/vector_store/"):
+
+    # Below this corpus size the exhaustive scan is cheaper than LSH probing
+    _LSH_MIN_SIZE = 256
+    # Above this many rows the parallel numba kernel beats the single-core matmul
+    _PARALLEL_MIN_ROWS = 1024
+    # Rewrite files once this fraction of rows are tombstoned
+    _COMPACT_RATIO = 0.2
+
+    def __init__(self,
+                 storage_path: str = "./memory/vector_store/",
+                 quantize: bool = True,
+                 lsh_bits: int = 64,
+                 lsh_tables: int = 4):
         """
         Initialize vector store.
-        
+
         Args:
             storage_path: Directory for storing embeddings
+            quantize: Search over an int8-quantized copy of the embedding
+                matrix (per-row symmetric scales). Quarters memory traffic
+                on the search hot path; set False for exact float32 scoring.
+            lsh_bits: SimHash signature width for the LSH candidate index
+            lsh_tables: Number of signature bands; candidates are the union
+                of same-band bucket hits
         """
         self.storage_path = storage_path
+        self.quantize = quantize
+        self.lsh_bits = lsh_bits
+        self.lsh_tables = lsh_tables
         os.makedirs(storage_path, exist_ok=True)
-        self.vectors_file = os.path.join(storage_path, "vectors.json")
-        self._ensure_vectors_file()
-    
-    def _ensure_vectors_file(self):
-        """Create vectors file if it doesn't exist."""
-        if not os.path.exists(self.vectors_file):
-            with open(self.vectors_file, 'w') as f:
-                json.dump({"vectors": []}, f)
-    
-    def add_vector(self, 
-                   memory_id: str, 
-                   text: str, 
-                   embedding: List[float], 
+        self._bin_path = os.path.join(storage_path, "vectors.bin")
+        self._meta_path = os.path.join(storage_path, "meta.jsonl")
+        # Earlier on-disk layouts, migrated on first open
+        self._npy_path = os.path.join(storage_path, "vectors.npy")
+        self._legacy_file = os.path.join(storage_path, "vectors.json")
+
+        # Metadata records (no embeddings) aligned row-for-row with a
+        # float32 matrix whose capacity grows by doubling; _count is the
+        # physical row count and _deleted holds tombstoned rows.
+        self._meta: List[Dict[str, Any]] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._count = 0
+        self._deleted: set = set()
+        self._load()
+
+        # Lazily built search caches, invalidated on add/delete
+        self._live: Optional[np.ndarray] = None
+        self._norm_matrix: Optional[np.ndarray] = None
+        self._q_matrix: Optional[np.ndarray] = None
+        self._q_scales: Optional[np.ndarray] = None
+        self._q_norms: Optional[np.ndarray] = None
+        self._lsh_proj: Optional[np.ndarray] = None
+        self._lsh_buckets: Optional[List[Dict[int, np.ndarray]]] = None
+
+    def _invalidate_caches(self):
+        """Drop derived search caches after the matrix changes."""
+        self._live = None
+        self._norm_matrix = None
+        self._q_matrix = None
+        self._q_scales = None
+        self._q_norms = None
+        self._lsh_buckets = None
+
+    def _load(self):
+        """Load persisted vectors, migrating older formats in place."""
+        if os.path.exists(self._meta_path):
+            records = []
+            tombstones = set()
+            with open(self._meta_path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = _loads(line)
+                    if "deleted" in entry:
+                        tombstones.add(entry["deleted"])
+                    else:
+                        records.append(entry)
+            self._meta = records
+            for row, record in enumerate(records):
+                if record["vector_id"] in tombstones:
+                    self._deleted.add(row)
+
+            if records and os.path.exists(self._bin_path):
+                # frombuffer wraps the raw bytes without per-float
+                # conversion or boxing
+                with open(self._bin_path, 'rb') as f:
+                    raw = np.frombuffer(f.read(), dtype=np.float32)
+                self._matrix = raw.reshape(len(records), -1)
+                self._count = len(records)
+            elif records and os.path.exists(self._npy_path):
+                # Migrate the .npy layout to raw append-friendly rows
+                self._matrix = np.load(self._npy_path).astype(np.float32, copy=False)
+                self._count = len(records)
+                self._rewrite_files()
+        elif os.path.exists(self._legacy_file):
+            # One-time migration from the old vectors.json layout
+            with open(self._legacy_file, 'rb') as f:
+                data = _loads(f.read())
+            for record in data.get("vectors", []):
+                embedding = record.pop("embedding", [])
+                self._meta.append(record)
+                self._append_embedding(embedding)
+            self._rewrite_files()
+
+    def _append_embedding(self, embedding: List[float]) -> np.ndarray:
+        """Append one embedding row, doubling capacity as needed."""
+        row = np.asarray(embedding, dtype=np.float32)
+        if self._matrix is None:
+            self._matrix = np.empty((8, row.shape[0]), dtype=np.float32)
+        elif self._count == self._matrix.shape[0]:
+            grown = np.empty((self._matrix.shape[0] * 2, self._matrix.shape[1]),
+                             dtype=np.float32)
+            grown[:self._count] = self._matrix[:self._count]
+            self._matrix = grown
+        self._matrix[self._count] = row
+        self._count += 1
+        return row
+
+    def _rewrite_files(self):
+        """Fully rewrite both files (migration and compaction only)."""
+        if self._deleted:
+            keep = [row for row in range(self._count) if row not in self._deleted]
+            self._meta = [self._meta[row] for row in keep]
+            if self._matrix is not None:
+                self._matrix = self._matrix[keep]
+            self._count = len(self._meta)
+            self._deleted = set()
+        if self._matrix is not None:
+            self._matrix[:self._count].tofile(self._bin_path)
+        with open(self._meta_path, 'wb') as f:
+            for record in self._meta:
+                f.write(_dumps(record))
+                f.write(b"\n")
+
+    def add_vector(self,
+                   memory_id: str,
+                   text: str,
+                   embedding: List[float],
                    metadata: Dict[str, Any] = None) -> str:
         """
         Add a vector to the store.
-        
+
         Args:
             memory_id: Reference to long-term memory ID
             text: Original text/description
             embedding: Vector embedding (list of floats)
             metadata: Optional metadata
-            
+
         Returns:
             vector_id: Unique ID for this vector
         """
         vector_id = f"vec_{memory_id}"
-        
-        vector_record = {
+
+        record = {
             "vector_id": vector_id,
             "memory_id": memory_id,
             "text": text,
-            "embedding": embedding,
             "metadata": metadata or {}
         }
-        
-        # Load existing vectors
-        with open(self.vectors_file, 'r') as f:
-            data = json.load(f)
-        
-        # Add new vector
-        data["vectors"].append(vector_record)
-        
-        # Save
-        with open(self.vectors_file, 'w') as f:
-            json.dump(data, f, indent=2)
-        
+        self._meta.append(record)
+        row = self._append_embedding(embedding)
+        self._invalidate_caches()
+
+        # Append-only persistence: one raw row + one meta line
+        with open(self._bin_path, 'ab') as f:
+            row.tofile(f)
+        with open(self._meta_path, 'ab') as f:
+            f.write(_dumps(record))
+            f.write(b"\n")
+
         return vector_id
-    
-    def similarity_search(self, 
-                         query_embedding: List[float], 
-                         top_k: int = 5, 
+
+    def _get_live(self) -> np.ndarray:
+        """Physical row indices of non-tombstoned vectors."""
+        if self._live is None:
+            if self._deleted:
+                self._live = np.asarray(
+                    [row for row in range(self._count) if row not in self._deleted])
+            else:
+                self._live = np.arange(self._count)
+        return self._live
+
+    def _get_norm_matrix(self) -> np.ndarray:
+        """Build (or reuse) the row-normalized embedding matrix."""
+        if self._norm_matrix is None:
+            matrix = self._matrix[:self._count][self._get_live()]
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._norm_matrix = matrix / norms
+        return self._norm_matrix
+
+    def _get_quantized(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Build (or reuse) the int8 matrix with per-row scales and norms."""
+        if self._q_matrix is None:
+            matrix = self._matrix[:self._count][self._get_live()]
+            scales = np.abs(matrix).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            self._q_matrix = np.round(matrix / scales[:, None]).astype(np.int8)
+            self._q_scales = scales.astype(np.float32)
+            norms = np.linalg.norm(matrix, axis=1)
+            norms[norms == 0] = 1.0
+            self._q_norms = norms.astype(np.float32)
+        return self._q_matrix, self._q_scales, self._q_norms
+
+    def _quantized_similarities(self,
+                                query: np.ndarray,
+                                candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarities via int8 dot products with int32 accumulation."""
+        q_matrix, scales, norms = self._get_quantized()
+        if candidates is not None:
+            q_matrix = q_matrix[candidates]
+            scales = scales[candidates]
+            norms = norms[candidates]
+        q_scale = np.abs(query).max() / 127.0
+        if q_scale == 0:
+            return np.zeros(len(q_matrix), dtype=np.float32)
+        q_int8 = np.round(query / q_scale).astype(np.int8)
+        raw = np.matmul(q_matrix, q_int8, dtype=np.int32)
+        # query is already unit-norm, so only row norms remain to divide out
+        return raw.astype(np.float32) * (scales * np.float32(q_scale)) / norms
+
+    def _similarities(self,
+                      query: np.ndarray,
+                      candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        """Score the (optionally shortlisted) live corpus against a unit query."""
+        if self.quantize:
+            return self._quantized_similarities(query, candidates)
+        matrix = self._get_norm_matrix()
+        if candidates is not None:
+            matrix = matrix[candidates]
+        # Mid-size corpora scale near-linearly across cores with the
+        # prange kernel; small ones stay on the plain matmul
+        if HAVE_NUMBA and matrix.shape[0] >= self._PARALLEL_MIN_ROWS:
+            return _batch_dot(np.ascontiguousarray(matrix), query)
+        return matrix @ query
+
+    def _band_keys(self, bits: np.ndarray) -> np.ndarray:
+        """Pack sign bits into one integer bucket key per signature band."""
+        band_width = self.lsh_bits // self.lsh_tables
+        powers = 1 << np.arange(band_width, dtype=np.int64)
+        bands = bits.reshape(bits.shape[0], self.lsh_tables, band_width)
+        return bands @ powers
+
+    def _get_lsh_buckets(self) -> List[Dict[int, np.ndarray]]:
+        """Build (or reuse) per-band SimHash buckets over the live corpus."""
+        if self._lsh_buckets is None:
+            matrix = self._matrix[:self._count][self._get_live()]
+            if self._lsh_proj is None or self._lsh_proj.shape[1] != matrix.shape[1]:
+                # Seeded so signatures are stable across restarts
+                rng = np.random.default_rng(42)
+                self._lsh_proj = rng.standard_normal(
+                    (self.lsh_bits, matrix.shape[1])).astype(np.float32)
+            bits = (matrix @ self._lsh_proj.T) > 0
+            keys = self._band_keys(bits)
+            self._lsh_buckets = []
+            for band in range(self.lsh_tables):
+                buckets: Dict[int, List[int]] = defaultdict(list)
+                for row, key in enumerate(keys[:, band]):
+                    buckets[int(key)].append(row)
+                self._lsh_buckets.append(
+                    {k: np.asarray(v) for k, v in buckets.items()})
+        return self._lsh_buckets
+
+    def _lsh_candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Union of bucket hits for the query across all signature bands."""
+        buckets = self._get_lsh_buckets()
+        bits = (self._lsh_proj @ query > 0).reshape(1, -1)
+        keys = self._band_keys(bits)[0]
+        hits = [buckets[band][int(key)]
+                for band, key in enumerate(keys)
+                if int(key) in buckets[band]]
+        if not hits:
+            return None
+        return np.unique(np.concatenate(hits))
+
+    def similarity_search(self,
+                         query_embedding: List[float],
+                         top_k: int = 5,
                          threshold: float = 0.6) -> List[Dict[str, Any]]:
         """
         Find similar vectors using cosine similarity.
-        
+
         Args:
             query_embedding: Query vector
             top_k: Number of results to return
             threshold: Minimum similarity score
-            
+
         Returns:
             List of similar records with similarity scores
         """
-        results = []
-        
-        # Load vectors
-        with open(self.vectors_file, 'r') as f:
-            data = json.load(f)
-        
-        # Compute similarity for each vector
-        similarities = []
-        for vector_record in data["vectors"]:
-            similarity = self._cosine_similarity(query_embedding, vector_record["embedding"])
-            if similarity >= threshold:
-                similarities.append((vector_record, similarity))
-        
-        # Sort by similarity (highest first)
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        
-        # Return top_k results
+        live = self._get_live()
+        if live.size == 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            return []
+        query /= query_norm
+
+        # For large corpora, probe the SimHash index to shortlist candidates
+        # instead of scoring every row; small corpora scan exhaustively
+        candidates = None
+        if live.size >= self._LSH_MIN_SIZE:
+            candidates = self._lsh_candidates(query)
+            if candidates is None:
+                return []
+
+        # Single matmul computes all cosine similarities at once; the
+        # quantized path streams 4x fewer bytes through the cache
+        sims = self._similarities(query, candidates)
+
+        # Threshold, select top_k via O(N) partition, then sort only those k
+        idx = np.where(sims >= threshold)[0]
+        k = min(top_k, idx.size)
+        if k < idx.size:
+            idx = idx[np.argpartition(-sims[idx], k - 1)[:k]]
+        idx = idx[np.argsort(-sims[idx])]
+        if candidates is not None:
+            rows = live[candidates[idx]]
+        else:
+            rows = live[idx]
+
         return [
             {
-                "vector_id": rec["vector_id"],
-                "memory_id": rec["memory_id"],
-                "text": rec["text"],
-                "similarity": sim,
-                "metadata": rec["metadata"]
+                "vector_id": self._meta[row]["vector_id"],
+                "memory_id": self._meta[row]["memory_id"],
+                "text": self._meta[row]["text"],
+                "similarity": float(sims[i]),
+                "metadata": self._meta[row]["metadata"]
             }
-            for rec, sim in similarities[:top_k]
+            for i, row in zip(idx, rows)
         ]
-    
+
     def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """
         Compute cosine similarity between two vectors.
-        
+
         Args:
             vec1: First vector
             vec2: Second vector
-            
+
         Returns:
             Cosine similarity score (0-1)
         """
         if len(vec1) != len(vec2):
             return 0.0
-        
-        # Dot product
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        
-        # Magnitudes
-        mag1 = math.sqrt(sum(a * a for a in vec1))
-        mag2 = math.sqrt(sum(b * b for b in vec2))
-        
-        if mag1 == 0 or mag2 == 0:
-            return 0.0
-        
-        return dot_product / (mag1 * mag2)
-    
+
+        # Compiled kernel (numba when available) vectorizes the dot/norm loop
+        a = np.ascontiguousarray(vec1, dtype=np.float32)
+        b = np.ascontiguousarray(vec2, dtype=np.float32)
+        return float(_cosine_kernel(a, b))
+
     def get_vector(self, vector_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a specific vector by ID.
-        
+
         Args:
             vector_id: Vector ID
-            
+
         Returns:
             Vector record or None
         """
-        with open(self.vectors_file, 'r') as f:
-            data = json.load(f)
-        
-        for vector_record in data["vectors"]:
-            if vector_record["vector_id"] == vector_id:
-                return vector_record
-        
+        for row, record in enumerate(self._meta):
+            if record["vector_id"] == vector_id and row not in self._deleted:
+                return {**record, "embedding": self._matrix[row].tolist()}
+
         return None
-    
+
     def delete_vector(self, vector_id: str) -> bool:
-        """Delete a vector by ID."""
-        with open(self.vectors_file, 'r') as f:
-            data = json.load(f)
-        
-        original_count = len(data["vectors"])
-        data["vectors"] = [v for v in data["vectors"] if v["vector_id"] != vector_id]
-        
-        if len(data["vectors"]) < original_count:
-            with open(self.vectors_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            return True
-        
+        """Delete a vector by ID (tombstoned; files compact periodically)."""
+        for row, record in enumerate(self._meta):
+            if record["vector_id"] == vector_id and row not in self._deleted:
+                self._deleted.add(row)
+                self._invalidate_caches()
+                if len(self._deleted) > self._COMPACT_RATIO * self._count:
+                    self._rewrite_files()
+                else:
+                    with open(self._meta_path, 'ab') as f:
+                        f.write(_dumps({"deleted": vector_id}))
+                        f.write(b"\n")
+                return True
+
         return False
-    
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about vectors."""
-        with open(self.vectors_file, 'r') as f:
-            data = json.load(f)
-        
+        size_bytes = 0
+        for path in (self._bin_path, self._meta_path):
+            if os.path.exists(path):
+                size_bytes += os.path.getsize(path)
+
         return {
-            "total_vectors": len(data["vectors"]),
-            "vectors_file_size_kb": os.path.getsize(self.vectors_file) / 1024
+            "total_vectors": self._count - len(self._deleted),
+            "vectors_file_size_kb": size_bytes / 1024
         }
 
 
+# Shared default instance so the memory subsystems don't each pay their
+# own storage IO and caches
+_default_instance: Optional[SimpleVectorStore] = None
+_default_lock = threading.Lock()
+
+
+def get_default_vector_store() -> SimpleVectorStore:
+    """Return the process-wide shared SimpleVectorStore instance."""
+    global _default_instance
+    if _default_instance is None:
+        with _default_lock:
+            if _default_instance is None:
+                _default_instance = SimpleVectorStore()
+    return _default_instance
+
+
 # Example usage
 if __name__ == "__main__":
     # Initialize vector store
     vs = SimpleVectorStore()
-    
+
     # Add sample vectors (in reality, these come from an embedding model)
     sample_embedding1 = [0.1, 0.2, 0.3, 0.4, 0.5]
     sample_embedding2 = [0.1, 0.2, 0.3, 0.4, 0.5]  # Highly similar
     sample_embedding3 = [0.9, 0.8, 0.7, 0.6, 0.5]  # Different
-    
+
     vs.add_vector("mem_001", "Analyze telecom KPIs", sample_embedding1)
     vs.add_vector("mem_002", "Analyze network metrics", sample_embedding2)
     vs.add_vector("mem_003", "Generate report", sample_embedding3)
-    
+
     # Search for similar vectors
     query = [0.1, 0.2, 0.3, 0.4, 0.5]
     results = vs.similarity_search(query, top_k=2, threshold=0.5)
     print(f"Similar vectors: {results}")
-    
+
     # Statistics
     stats = vs.get_statistics()
     print(f"Vector store stats: {stats}")
@@ -1,13 +1,19 @@
 from typing import Dict, Any, Optional, Callable, List
 from .message import Message, MessageType, PriorityLevel
-from .message_broker import MessageBroker
+from .message_broker import MessageBroker, message_pool
 
 class AgentCommunication:
     """
     Communication interface for individual agents.
     Each agent uses this to send/receive messages.
     """
-    
+
+    # One instance exists per agent; slots keep the fleet's footprint
+    # flat and make attribute access an offset load
+    __slots__ = ('agent_id', 'broker', 'sent_count', 'received_count',
+                 'message_handlers', '_handlers_by_type')
+
+
     def __init__(self, agent_id: str, broker: MessageBroker):
         """
         Initialize agent communication.
@@ -18,9 +24,15 @@ class AgentCommunication:
         """
         self.agent_id = agent_id
         self.broker = broker
-        self.sent_messages: Dict[str, Message] = {}
-        self.received_messages: Dict[str, Message] = {}
+        # Plain counters: retaining every message here only ever served
+        # len() lookups and leaked memory; by-id lookup goes through
+        # broker.get_message
+        self.sent_count = 0
+        self.received_count = 0
         self.message_handlers: Dict[str, List[Callable]] = {}
+        # Immutable handler tuples rebuilt only at registration time so
+        # dispatch avoids per-message list materialization
+        self._handlers_by_type: Dict[MessageType, tuple] = {}
     
     def send_request(self, 
                     receiver_id: str, 
@@ -44,7 +56,7 @@ class AgentCommunication:
             "data": data or {}
         }
         
-        message = Message(
+        message = message_pool.acquire(
             sender_id=self.agent_id,
             receiver_id=receiver_id,
             message_type=MessageType.REQUEST,
@@ -53,7 +65,7 @@ class AgentCommunication:
         )
         
         if self.broker.send_message(message):
-            self.sent_messages[message.message_id] = message
+            self.sent_count += 1
             return message.message_id
         
         return None
@@ -75,7 +87,7 @@ class AgentCommunication:
         """
         payload = {"result": result}
         
-        message = Message(
+        message = message_pool.acquire(
             sender_id=self.agent_id,
             receiver_id=receiver_id,
             message_type=MessageType.RESPONSE,
@@ -84,7 +96,7 @@ class AgentCommunication:
         )
         
         if self.broker.send_message(message):
-            self.sent_messages[message.message_id] = message
+            self.sent_count += 1
             return message.message_id
         
         return None
@@ -99,7 +111,7 @@ class AgentCommunication:
         message = self.broker.receive_message(self.agent_id)
         
         if message:
-            self.received_messages[message.message_id] = message
+            self.received_count += 1
         
         return message
     
@@ -121,30 +133,39 @@ class AgentCommunication:
         """
         if message_type not in self.message_handlers:
             self.message_handlers[message_type] = []
-        
+
         self.message_handlers[message_type].append(handler)
+        self._handlers_by_type[message_type] = tuple(self.message_handlers[message_type])
     
     def handle_incoming_messages(self):
-        """Process all pending messages."""
+        """Process all pending messages in batches."""
+        get_handlers = self._handlers_by_type.get
+
         while True:
-            msg = self.receive_message()
-            if not msg:
+            # One lock acquisition per batch instead of per message
+            batch = self.broker.drain(self.agent_id)
+            if not batch:
                 break
-            
-            # Call appropriate handler
-            handlers = self.message_handlers.get(msg.message_type, [])
-            for handler in handlers:
-                try:
-                    handler(msg)
-                except Exception as e:
-                    print(f"Error handling message: {e}")
+
+            self.received_count += len(batch)
+
+            for msg in batch:
+                # Call appropriate handler
+                handlers = get_handlers(msg.message_type)
+                if not handlers:
+                    continue
+                for handler in handlers:
+                    try:
+                        handler(msg)
+                    except Exception as e:
+                        print(f"Error handling message: {e}")
     
     def get_communication_status(self) -> Dict[str, Any]:
         """Get communication status."""
         return {
             "agent_id": self.agent_id,
-            "sent_messages": len(self.sent_messages),
-            "received_messages": len(self.received_messages),
+            "sent_messages": self.sent_count,
+            "received_messages": self.received_count,
             "pending_messages": self.get_pending_count()
         }
 
@@ -1,7 +1,42 @@
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
+from collections import deque
 from datetime import datetime, timedelta
 from enum import Enum
-import statistics
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    HAVE_NUMBA = True
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _batch_drift(current, baseline, threshold):
+        """Drift scores and drifted mask for all (agent, metric) pairs
+        at once, parallelized across cores."""
+        n = current.shape[0]
+        scores = np.empty(n)
+        for i in prange(n):
+            b = baseline[i]
+            if b == 0.0:
+                scores[i] = 1.0 if current[i] != 0.0 else 0.0
+            else:
+                scores[i] = abs(current[i] - b) / abs(b)
+        return scores, scores > threshold
+
+except ImportError:
+    HAVE_NUMBA = False
+
+    def _batch_drift(current, baseline, threshold):
+        """Drift scores and drifted mask (NumPy fallback)."""
+        safe = np.where(baseline == 0.0, 1.0, baseline)
+        scores = np.where(
+            baseline == 0.0,
+            (current != 0.0).astype(np.float64),
+            np.abs(current - baseline) / np.abs(safe)
+        )
+        return scores, scores > threshold
+
 
 class DriftAlertLevel(Enum):
     """Drift alert severity levels."""
@@ -14,166 +49,240 @@ class DriftDetector:
     Detects when agents deviate from expected behavior (drift).
     Monitors quality metrics and alerts when thresholds are exceeded.
     """
-    
-    def __init__(self, 
+
+    # Number of most recent samples averaged in analyze_agent_drift
+    _RECENT_WINDOW = 50
+
+    __slots__ = ('baseline_window_size', 'deviation_threshold', 'values',
+                 'timestamps', '_sizes', 'running', 'recent',
+                 'metric_names', 'baselines', 'drift_history')
+
+    def __init__(self,
                  baseline_window_size: int = 100,
                  deviation_threshold: float = 0.2):
         """
         Initialize drift detector.
-        
+
         Args:
             baseline_window_size: Number of samples for baseline
             deviation_threshold: Threshold for drift detection (0-1)
         """
         self.baseline_window_size = baseline_window_size
         self.deviation_threshold = deviation_threshold
-        self.agent_metrics: Dict[str, List[Dict[str, float]]] = {}
+        # Structure-of-arrays storage: one growable float array of values
+        # (and one of timestamps) per (agent, metric) pair, so baselines
+        # and recent means are single vectorized reductions
+        self.values: Dict[Tuple[str, str], np.ndarray] = {}
+        self.timestamps: Dict[Tuple[str, str], np.ndarray] = {}
+        self._sizes: Dict[Tuple[str, str], int] = {}
+        # Welford running stats [n, mean, M2] per (agent, metric),
+        # frozen once n reaches the baseline window
+        self.running: Dict[Tuple[str, str], List[float]] = {}
+        # Sliding recent window per (agent, metric): bounded deque plus a
+        # running sum so the recent mean is an O(1) read
+        self.recent: Dict[Tuple[str, str], Tuple[deque, List[float]]] = {}
+        self.metric_names: Dict[str, Set[str]] = {}
         self.baselines: Dict[str, Dict[str, float]] = {}
         self.drift_history: Dict[str, List[Dict[str, Any]]] = {}
-    
-    def record_metric(self, 
-                     agent_id: str, 
-                     metric_name: str, 
+
+    def record_metric(self,
+                     agent_id: str,
+                     metric_name: str,
                      value: float,
                      timestamp: Optional[datetime] = None):
         """
         Record a metric for an agent.
-        
+
         Args:
             agent_id: Agent ID
             metric_name: Name of metric
             value: Metric value
             timestamp: Optional timestamp
         """
-        if agent_id not in self.agent_metrics:
-            self.agent_metrics[agent_id] = []
-        
-        metric = {
-            "metric": metric_name,
-            "value": value,
-            "timestamp": timestamp or datetime.now()
-        }
-        
-        self.agent_metrics[agent_id].append(metric)
-        
-        # Keep only recent metrics
-        if len(self.agent_metrics[agent_id]) > self.baseline_window_size * 2:
-            self.agent_metrics[agent_id] = self.agent_metrics[agent_id][-self.baseline_window_size:]
-    
+        key = (agent_id, metric_name)
+        values = self.values.get(key)
+
+        if values is None:
+            values = np.empty(16, dtype=np.float64)
+            self.values[key] = values
+            self.timestamps[key] = np.empty(16, dtype=np.float64)
+            self._sizes[key] = 0
+            self.metric_names.setdefault(agent_id, set()).add(metric_name)
+
+        size = self._sizes[key]
+
+        if size == values.shape[0]:
+            capacity = self.baseline_window_size * 2
+            if size >= capacity:
+                # Bounded window: shift the most recent samples to the
+                # front in place instead of reallocating, keeping both
+                # append cost and memory O(window)
+                keep = self.baseline_window_size
+                values[:keep] = values[size - keep:size]
+                stamps = self.timestamps[key]
+                stamps[:keep] = stamps[size - keep:size]
+                size = keep
+            else:
+                # Grow by doubling (up to the bound) so appends stay
+                # O(1) amortized
+                values = np.resize(values, min(size * 2, capacity))
+                self.values[key] = values
+                self.timestamps[key] = np.resize(self.timestamps[key],
+                                                 values.shape[0])
+
+        values[size] = value
+        self.timestamps[key][size] = (timestamp or datetime.now()).timestamp()
+        self._sizes[key] = size + 1
+
+        # Update the running baseline stats incrementally (Welford) so
+        # compute_baseline never has to re-scan the window; frozen once
+        # the baseline window is full
+        stats = self.running.get(key)
+        if stats is None:
+            stats = [0, 0.0, 0.0]
+            self.running[key] = stats
+        if stats[0] < self.baseline_window_size:
+            stats[0] += 1
+            delta = value - stats[1]
+            stats[1] += delta / stats[0]
+            stats[2] += delta * (value - stats[1])
+
+        # Keep the recent-window running sum current: subtract the value
+        # about to be evicted before the bounded deque drops it
+        recent = self.recent.get(key)
+        if recent is None:
+            recent = (deque(maxlen=self._RECENT_WINDOW), [0.0])
+            self.recent[key] = recent
+        window, total = recent
+        if len(window) == self._RECENT_WINDOW:
+            total[0] -= window[0]
+        window.append(value)
+        total[0] += value
+
     def compute_baseline(self, agent_id: str, metric_name: str) -> Optional[float]:
         """
         Compute baseline (average) for a metric.
-        
+
         Args:
             agent_id: Agent ID
             metric_name: Metric name
-            
+
         Returns:
             Average value or None
         """
-        if agent_id not in self.agent_metrics:
-            return None
-        
-        values = [
-            m["value"] for m in self.agent_metrics[agent_id]
-            if m["metric"] == metric_name
-        ]
-        
-        if len(values) < self.baseline_window_size:
+        stats = self.running.get((agent_id, metric_name))
+
+        if stats is None or stats[0] < self.baseline_window_size:
             return None
-        
-        # Use first baseline_window_size samples
-        baseline = statistics.mean(values[:self.baseline_window_size])
-        
+
+        # Running mean of the first baseline_window_size samples,
+        # maintained incrementally by record_metric — O(1) here
+        baseline = stats[1]
+
         if agent_id not in self.baselines:
             self.baselines[agent_id] = {}
-        
+
         self.baselines[agent_id][metric_name] = baseline
-        
+
         return baseline
-    
-    def detect_drift(self, 
-                    agent_id: str, 
-                    metric_name: str, 
+
+    def get_baseline_std(self, agent_id: str, metric_name: str) -> Optional[float]:
+        """
+        Standard deviation of the baseline window, from the running M2.
+
+        Args:
+            agent_id: Agent ID
+            metric_name: Metric name
+
+        Returns:
+            Baseline standard deviation or None if not enough samples
+        """
+        stats = self.running.get((agent_id, metric_name))
+
+        if stats is None or stats[0] < 2:
+            return None
+
+        return (stats[2] / stats[0]) ** 0.5
+
+    def detect_drift(self,
+                    agent_id: str,
+                    metric_name: str,
                     current_value: float) -> Tuple[bool, float]:
         """
         Detect if metric has drifted.
-        
+
         Args:
             agent_id: Agent ID
             metric_name: Metric name
             current_value: Current value
-            
+
         Returns:
             Tuple of (has_drifted, drift_score)
         """
         baseline = self.baselines.get(agent_id, {}).get(metric_name)
-        
+
         if baseline is None:
             return False, 0.0
-        
+
         # Calculate drift as percentage deviation
         if baseline == 0:
             drift_score = 1.0 if current_value != 0 else 0.0
         else:
             drift_score = abs(current_value - baseline) / abs(baseline)
-        
+
         has_drifted = drift_score > self.deviation_threshold
-        
+
         return has_drifted, drift_score
-    
+
     def analyze_agent_drift(self, agent_id: str) -> Dict[str, Any]:
         """
         Comprehensive drift analysis for an agent.
-        
+
         Args:
             agent_id: Agent ID
-            
+
         Returns:
             Drift analysis report
         """
-        if agent_id not in self.agent_metrics:
+        metrics_set = self.metric_names.get(agent_id)
+        if not metrics_set:
             return {"error": "No metrics found"}
-        
+
         # Compute baselines if not exists
-        metrics_set = set()
-        for m in self.agent_metrics[agent_id]:
-            metrics_set.add(m["metric"])
-        
         for metric_name in metrics_set:
             if metric_name not in self.baselines.get(agent_id, {}):
                 self.compute_baseline(agent_id, metric_name)
-        
+
         # Analyze drift for each metric
         drift_metrics = {}
         overall_drift_score = 0.0
         drifted_count = 0
-        
-        # Get recent values
-        recent_metrics = self.agent_metrics[agent_id][-50:] if self.agent_metrics[agent_id] else []
-        
+
         for metric_name in metrics_set:
-            recent_values = [m["value"] for m in recent_metrics if m["metric"] == metric_name]
-            
-            if recent_values:
-                current_value = statistics.mean(recent_values)
+            key = (agent_id, metric_name)
+            recent = self.recent.get(key)
+
+            if recent and recent[0]:
+                # O(1) mean over the sliding recent window
+                window, total = recent
+                current_value = total[0] / len(window)
                 has_drifted, drift_score = self.detect_drift(agent_id, metric_name, current_value)
-                
+
                 drift_metrics[metric_name] = {
                     "baseline": self.baselines.get(agent_id, {}).get(metric_name, 0),
                     "current": current_value,
                     "drift_score": drift_score,
                     "drifted": has_drifted
                 }
-                
+
                 if has_drifted:
                     drifted_count += 1
-                
+
                 overall_drift_score += drift_score
-        
+
         if metrics_set:
             overall_drift_score /= len(metrics_set)
-        
+
         # Determine alert level
         if overall_drift_score > 0.5:
             alert_level = DriftAlertLevel.CRITICAL
@@ -181,7 +290,7 @@ class DriftDetector:
             alert_level = DriftAlertLevel.WARNING
         else:
             alert_level = DriftAlertLevel.NORMAL
-        
+
         report = {
             "agent_id": agent_id,
             "timestamp": datetime.now().isoformat(),
@@ -192,15 +301,61 @@ class DriftDetector:
             "total_metrics": len(metrics_set),
             "alert_level": alert_level.value
         }
-        
+
         # Store in history
         if agent_id not in self.drift_history:
             self.drift_history[agent_id] = []
-        
+
         self.drift_history[agent_id].append(report)
-        
+
         return report
-    
+
+    def analyze_all_agents(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Evaluate drift for every tracked (agent, metric) pair in one
+        batched kernel call.
+
+        Returns:
+            Per-agent dict of per-metric drift results
+        """
+        keys = []
+        current = []
+        baseline = []
+
+        # Pack current means and baselines into flat arrays
+        for key, (window, total) in self.recent.items():
+            if not window:
+                continue
+            agent_id, metric_name = key
+            base = self.baselines.get(agent_id, {}).get(metric_name)
+            if base is None:
+                base = self.compute_baseline(agent_id, metric_name)
+            if base is None:
+                continue
+            keys.append(key)
+            current.append(total[0] / len(window))
+            baseline.append(base)
+
+        if not keys:
+            return {}
+
+        scores, drifted = _batch_drift(
+            np.asarray(current), np.asarray(baseline),
+            self.deviation_threshold
+        )
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for (agent_id, metric_name), cur, base, score, flag in zip(
+                keys, current, baseline, scores, drifted):
+            results.setdefault(agent_id, {})[metric_name] = {
+                "baseline": base,
+                "current": cur,
+                "drift_score": float(score),
+                "drifted": bool(flag)
+            }
+
+        return results
+
     def get_drift_history(self, agent_id: str, last_n: int = 10) -> List[Dict[str, Any]]:
         """Get recent drift reports for an agent."""
         history = self.drift_history.get(agent_id, [])
@@ -210,21 +365,21 @@ class DriftDetector:
 # Example usage
 if __name__ == "__main__":
     detector = DriftDetector()
-    
+
     # Record baseline metrics
     for i in range(100):
         detector.record_metric("agent_001", "output_quality", 0.92 + (i % 5) * 0.01)
         detector.record_metric("agent_001", "response_time", 1200 + (i % 100))
-    
+
     # Compute baselines
     detector.compute_baseline("agent_001", "output_quality")
     detector.compute_baseline("agent_001", "response_time")
-    
+
     # Record drifted metrics
     for i in range(10):
         detector.record_metric("agent_001", "output_quality", 0.75 + (i % 3) * 0.02)
         detector.record_metric("agent_001", "response_time", 2500 + (i % 50))
-    
+
     # Analyze drift
     analysis = detector.analyze_agent_drift("agent_001")
     print(f"Drift analysis: {analysis}")
@@ -1,15 +1,66 @@
 from typing import Dict, List, Optional, Callable
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 from .message import Message, MessageStatus
 from datetime import datetime
+import heapq
+import itertools
+import logging
 import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class MessagePool:
+    """
+    Bounded freelist of Message instances.
+    Recycling retired messages avoids a fresh allocation per send
+    under steady-state broker traffic.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        """
+        Initialize the pool.
+
+        Args:
+            capacity: Maximum number of idle messages kept for reuse
+        """
+        self._free: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def acquire(self, *args, **kwargs) -> Message:
+        """Return a recycled Message reinitialized with the given fields,
+        or a newly constructed one when the freelist is empty."""
+        with self._lock:
+            message = self._free.pop() if self._free else None
+        if message is None:
+            return Message(*args, **kwargs)
+        message._reset(*args, **kwargs)
+        return message
+
+    def release(self, message: Message):
+        """Return a retired message to the freelist for reuse.
+        Callers must not keep references to released messages."""
+        with self._lock:
+            self._free.append(message)
+
+
+# Shared pool used by the broker and agent communication layers
+message_pool = MessagePool()
+
 
 class MessageBroker:
     """
     Central message hub for agent-to-agent communication.
     Routes messages, manages queues, handles delivery.
     """
-    
+
+    __slots__ = ('max_queue_size', 'message_ttl_seconds', 'agent_queues',
+                 '_seq', '_queue_locks', '_registry_lock',
+                 'message_history', 'history_cap', 'message_handlers',
+                 'lock', '_sent', '_delivered', '_failed', '_stat_reads',
+                 '_handler_errors', '_handler_error_reads')
+
+
     def __init__(self, max_queue_size: int = 1000, message_ttl_seconds: int = 3600):
         """
         Initialize message broker.
@@ -20,88 +71,156 @@ class MessageBroker:
         """
         self.max_queue_size = max_queue_size
         self.message_ttl_seconds = message_ttl_seconds
-        self.agent_queues: Dict[str, deque] = defaultdict(deque)
-        self.message_history: Dict[str, Message] = {}
+        # Per-agent priority queues (heaps keyed by negated priority and
+        # a FIFO sequence number), each guarded by its own lock so
+        # producers and consumers of different agents never contend
+        self.agent_queues: Dict[str, list] = {}
+        self._seq = itertools.count()
+        self._queue_locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        # Bounded FIFO history: oldest entries are evicted past the cap
+        # so a long-running broker doesn't retain every message ever sent
+        self.message_history: "OrderedDict[str, Message]" = OrderedDict()
+        self.history_cap = 10_000
         self.message_handlers: Dict[str, List[Callable]] = defaultdict(list)
+        # Guards message_history only; queue access uses the per-agent
+        # locks above
         self.lock = threading.Lock()
-        self.stats = {
-            "total_messages_sent": 0,
-            "total_messages_delivered": 0,
-            "total_messages_failed": 0
-        }
-    
+        # Stats counters: next() on itertools.count is a single atomic
+        # bytecode under the GIL, so increments need no lock at all.
+        # _stat_reads tracks how many times each counter was consumed by
+        # sampling so get_statistics can subtract its own reads out
+        self._sent = itertools.count()
+        self._delivered = itertools.count()
+        self._failed = itertools.count()
+        self._stat_reads = [0, 0, 0]
+        self._handler_errors = itertools.count()
+        self._handler_error_reads = 0
+
+    @staticmethod
+    def _advance(counter, n: int):
+        """Advance a stats counter by n in one call."""
+        if n > 0:
+            next(itertools.islice(counter, n - 1, n))
+
+    def _get_queue(self, agent_id: str):
+        """Return (lock, queue) for an agent, creating both on first use."""
+        lock = self._queue_locks.get(agent_id)
+        if lock is None:
+            with self._registry_lock:
+                lock = self._queue_locks.get(agent_id)
+                if lock is None:
+                    lock = threading.Lock()
+                    self.agent_queues[agent_id] = []
+                    self._queue_locks[agent_id] = lock
+        return lock, self.agent_queues[agent_id]
+
     def send_message(self, message: Message) -> bool:
         """
         Send a message to an agent.
-        
+
         Args:
             message: Message to send
-            
+
         Returns:
             True if successful
         """
-        with self.lock:
+        queue_lock, queue = self._get_queue(message.receiver_id)
+
+        with queue_lock:
             # Check queue size
-            if len(self.agent_queues[message.receiver_id]) >= self.max_queue_size:
+            if len(queue) >= self.max_queue_size:
                 message.mark_failed()
-                self.stats["total_messages_failed"] += 1
+                next(self._failed)
                 return False
-            
-            # Add to queue
+
+            # Add to queue; higher priority pops first, FIFO within a
+            # priority level via the sequence number
             message.mark_sent()
-            self.agent_queues[message.receiver_id].append(message)
-            self.message_history[message.message_id] = message
-            self.stats["total_messages_sent"] += 1
-            
+            heapq.heappush(queue, (-message.priority, next(self._seq), message))
+
             # Mark delivered
             message.mark_delivered()
-            self.stats["total_messages_delivered"] += 1
-            
-            # Call handlers
-            self._trigger_handlers(message.receiver_id, message)
-            
-            return True
-    
+
+        with self.lock:
+            self.message_history[message.message_id] = message
+            if len(self.message_history) > self.history_cap:
+                self.message_history.popitem(last=False)
+
+        # Counter bumps happen outside the critical section
+        next(self._sent)
+        next(self._delivered)
+
+        # Call handlers outside any lock
+        self._trigger_handlers(message.receiver_id, message)
+
+        return True
+
     def receive_message(self, agent_id: str) -> Optional[Message]:
         """
         Receive next message for an agent.
-        
+
         Args:
             agent_id: Agent ID
-            
+
         Returns:
             Next message or None if queue empty
         """
-        with self.lock:
-            queue = self.agent_queues[agent_id]
-            
+        queue_lock, queue = self._get_queue(agent_id)
+
+        with queue_lock:
             if queue:
-                # Get and remove oldest message
-                message = queue.popleft()
+                # Highest-priority message first, oldest within a level
+                message = heapq.heappop(queue)[2]
                 message.mark_processed()
                 return message
-            
+
             return None
-    
+
+    def drain(self, agent_id: str, max_batch: int = 64) -> List[Message]:
+        """
+        Receive up to max_batch messages in one lock acquisition.
+
+        Args:
+            agent_id: Agent ID
+            max_batch: Maximum messages to drain
+
+        Returns:
+            List of messages in delivery order (empty if queue is empty)
+        """
+        queue_lock, queue = self._get_queue(agent_id)
+
+        with queue_lock:
+            count = min(max_batch, len(queue))
+            batch = [heapq.heappop(queue)[2] for _ in range(count)]
+
+        # Status updates happen outside the lock
+        for message in batch:
+            message.mark_processed()
+
+        return batch
+
     def peek_messages(self, agent_id: str, max_count: int = 10) -> List[Message]:
         """
         Peek at messages without removing them.
-        
+
         Args:
             agent_id: Agent ID
             max_count: Maximum messages to peek
-            
+
         Returns:
             List of messages
         """
-        with self.lock:
-            queue = self.agent_queues[agent_id]
-            return list(queue)[:max_count]
-    
+        queue_lock, queue = self._get_queue(agent_id)
+
+        with queue_lock:
+            return [entry[2] for entry in heapq.nsmallest(max_count, queue)]
+
     def get_queue_size(self, agent_id: str) -> int:
         """Get number of pending messages for an agent."""
-        with self.lock:
-            return len(self.agent_queues[agent_id])
+        queue_lock, queue = self._get_queue(agent_id)
+        with queue_lock:
+            return len(queue)
     
     def get_message(self, message_id: str) -> Optional[Message]:
         """Get a specific message by ID."""
@@ -118,23 +237,55 @@ class MessageBroker:
         Returns:
             Number of successful sends
         """
-        success_count = 0
-        
+        # One payload copy and one clock read serve every recipient; the
+        # copy is shared by reference, so recipients must not mutate it
+        shared_payload = dict(message.payload)
+        now_mono = time.monotonic()
+        now_wall = time.time()
+
+        sent: List[Message] = []
+        failed = 0
+
         for agent_id in agent_ids:
-            # Create copy of message for each recipient
-            msg_copy = Message(
+            msg_copy = message_pool.acquire(
                 sender_id=message.sender_id,
                 receiver_id=agent_id,
                 message_type=message.message_type,
-                payload=message.payload.copy(),
+                payload=shared_payload,
                 priority=message.priority,
                 task_id=message.task_id
             )
-            
-            if self.send_message(msg_copy):
-                success_count += 1
-        
-        return success_count
+            msg_copy.created_at = now_mono
+            msg_copy.created_wall = now_wall
+
+            queue_lock, queue = self._get_queue(agent_id)
+            with queue_lock:
+                if len(queue) >= self.max_queue_size:
+                    msg_copy.mark_failed()
+                    failed += 1
+                    continue
+                msg_copy.status = MessageStatus.DELIVERED
+                msg_copy.sent_at = now_mono
+                msg_copy.delivered_at = now_mono
+                heapq.heappush(queue, (-msg_copy.priority, next(self._seq), msg_copy))
+            sent.append(msg_copy)
+
+        # Batch history and stats bookkeeping into one lock acquisition
+        # instead of one per recipient
+        with self.lock:
+            for msg in sent:
+                self.message_history[msg.message_id] = msg
+            while len(self.message_history) > self.history_cap:
+                self.message_history.popitem(last=False)
+
+        self._advance(self._sent, len(sent))
+        self._advance(self._delivered, len(sent))
+        self._advance(self._failed, failed)
+
+        for msg in sent:
+            self._trigger_handlers(msg.receiver_id, msg)
+
+        return len(sent)
     
     def register_handler(self, agent_id: str, handler: Callable):
         """
@@ -148,45 +299,93 @@ class MessageBroker:
     
     def _trigger_handlers(self, agent_id: str, message: Message):
         """Trigger all handlers for an agent."""
-        for handler in self.message_handlers[agent_id]:
+        # .get avoids growing the defaultdict for agents with no
+        # handlers; the tuple snapshot tolerates concurrent registration
+        handlers = self.message_handlers.get(agent_id)
+        if not handlers:
+            return
+        for handler in tuple(handlers):
             try:
                 handler(message)
-            except Exception as e:
-                print(f"Handler error: {e}")
+            except Exception:
+                # Counter bump plus log record — never blocking I/O like
+                # print on the delivery path
+                next(self._handler_errors)
+                logger.exception("Handler error for agent %s", agent_id)
     
     def cleanup_expired_messages(self) -> int:
         """Remove expired messages from queues."""
         expired_count = 0
-        
-        with self.lock:
-            for queue in self.agent_queues.values():
-                to_remove = []
-                for msg in queue:
-                    if msg.is_expired(self.message_ttl_seconds):
-                        to_remove.append(msg)
-                        expired_count += 1
-                
-                # Remove expired messages
-                for msg in to_remove:
-                    queue.remove(msg)
-        
+        # One clock read for the whole sweep; a message is expired when
+        # its monotonic creation time predates the cutoff
+        cutoff = time.monotonic() - self.message_ttl_seconds
+
+        with self._registry_lock:
+            agent_ids = list(self._queue_locks)
+
+        for agent_id in agent_ids:
+            queue_lock, queue = self._get_queue(agent_id)
+            with queue_lock:
+                # Single-pass partition, then rebuild the queue in bulk —
+                # O(n) instead of an O(n) deque.remove per expired message
+                kept = []
+                expired = []
+                for entry in queue:
+                    if entry[2].created_at < cutoff:
+                        expired.append(entry[2])
+                    else:
+                        kept.append(entry)
+                if expired:
+                    queue[:] = kept
+                    heapq.heapify(queue)
+
+            if not expired:
+                continue
+            expired_count += len(expired)
+
+            # Recycle expired messages once no longer reachable through
+            # the history
+            with self.lock:
+                for msg in expired:
+                    self.message_history.pop(msg.message_id, None)
+            for msg in expired:
+                message_pool.release(msg)
+
         return expired_count
-    
+
     def get_statistics(self) -> Dict[str, any]:
         """Get message broker statistics."""
+        with self._registry_lock:
+            agent_ids = list(self._queue_locks)
+
+        # Per-queue lengths read without a global lock; each len() is a
+        # consistent snapshot of that queue
+        queue_stats = {
+            agent_id: len(self.agent_queues[agent_id])
+            for agent_id in agent_ids
+        }
+
+        # Sampling a counter consumes one tick; subtract the ticks this
+        # method itself has consumed so the reported totals stay exact
         with self.lock:
-            queue_stats = {
-                agent_id: len(queue)
-                for agent_id, queue in self.agent_queues.items()
-            }
-            
+            reads = self._stat_reads
+            sent = next(self._sent) - reads[0]
+            reads[0] += 1
+            delivered = next(self._delivered) - reads[1]
+            reads[1] += 1
+            failed = next(self._failed) - reads[2]
+            reads[2] += 1
+            handler_errors = next(self._handler_errors) - self._handler_error_reads
+            self._handler_error_reads += 1
+
             return {
-                "total_messages_sent": self.stats["total_messages_sent"],
-                "total_messages_delivered": self.stats["total_messages_delivered"],
-                "total_messages_failed": self.stats["total_messages_failed"],
+                "total_messages_sent": sent,
+                "total_messages_delivered": delivered,
+                "total_messages_failed": failed,
                 "pending_messages_by_agent": queue_stats,
                 "total_pending": sum(queue_stats.values()),
-                "message_history_size": len(self.message_history)
+                "message_history_size": len(self.message_history),
+                "handler_errors": handler_errors
             }
 
 
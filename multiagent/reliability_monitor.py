@@ -1,8 +1,80 @@
 from typing import Dict, List, Any, Optional
+from collections import deque
 from datetime import datetime, timedelta
 from enum import Enum
+import array
+import bisect
+import math
 import time
 
+# Wall-clock anchor so monotonic nanosecond timestamps can be rendered
+# as ISO strings without a second clock read
+_WALL_OFFSET = time.time() - time.monotonic()
+
+
+def _iso_from_ns(ns: int) -> str:
+    """Render a monotonic-ns timestamp as a wall-clock ISO string."""
+    return datetime.fromtimestamp(ns * 1e-9 + _WALL_OFFSET).isoformat()
+
+
+# Exponential latency bucket upper bounds (ms), 1.5x factor from 50ms.
+# Counting samples per bucket makes "how many exceeded the threshold"
+# a short fixed-size sum instead of a scan over retained raw samples
+BUCKETS_MS = (50, 75, 112, 168, 252, 378, 567, 850, 1275, 1912, 2868,
+              4302, 6453, 9680)
+
+class LogLinearHist:
+    """
+    Log-linear latency histogram with a fixed bucket layout.
+    Records are O(1) and quantiles are one pass over ~90 fixed-size
+    unsigned counters, so per-agent memory stays constant no matter how
+    many samples arrive — unlike retaining raw response times.
+    """
+
+    # 5 sub-buckets per power of two covers 1ms..100s in ~90 buckets at
+    # roughly 10% relative error; bucket 0 holds everything <= 1ms
+    _SUB = 5
+    _NBUCKETS = 90
+
+    __slots__ = ('counts', 'total')
+
+    def __init__(self):
+        self.counts = array.array('I', bytes(4 * self._NBUCKETS))
+        self.total = 0
+
+    def record(self, value_ms: float):
+        """Record one sample (milliseconds)."""
+        if value_ms <= 1:
+            index = 0
+        else:
+            index = min(int(math.log2(value_ms) * self._SUB) + 1,
+                        self._NBUCKETS - 1)
+        self.counts[index] += 1
+        self.total += 1
+
+    def quantile(self, q: float) -> float:
+        """Approximate the q-th quantile (0..1) in milliseconds."""
+        if self.total == 0:
+            return 0.0
+        rank = q * self.total
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                if index == 0:
+                    return 1.0
+                # Geometric midpoint of the bucket's value range
+                return 2 ** ((index - 0.5) / self._SUB)
+        return 2 ** ((self._NBUCKETS - 0.5) / self._SUB)
+
+    def merge(self, other: "LogLinearHist"):
+        """Fold another histogram into this one (per-bucket add), e.g.
+        to build fleet-level percentiles across agents."""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+
+
 class HealthStatus(Enum):
     """Agent health status levels."""
     HEALTHY = "healthy"
@@ -31,24 +103,42 @@ class ReliabilityMonitor:
         self.health_check_timeout = health_check_timeout
         self.error_rate_threshold = error_rate_threshold
         self.response_time_threshold_ms = response_time_threshold_ms
+        # First bucket whose samples sit at or above the alert threshold,
+        # resolved once so _check_alerts never searches
+        self._threshold_bucket = bisect.bisect_left(
+            BUCKETS_MS, response_time_threshold_ms)
         self.agent_health: Dict[str, Dict[str, Any]] = {}
-        self.health_history: Dict[str, List[Dict[str, Any]]] = {}
-        self.alerts: Dict[str, List[Dict[str, str]]] = {}
+        self.health_history: Dict[str, deque] = {}
+        self.alerts: Dict[str, deque] = {}
     
     def register_agent(self, agent_id: str):
         """Register an agent for monitoring."""
         if agent_id not in self.agent_health:
+            now_ns = time.monotonic_ns()
             self.agent_health[agent_id] = {
                 "agent_id": agent_id,
                 "status": HealthStatus.HEALTHY.value,
-                "uptime_start": datetime.now(),
+                "uptime_start": now_ns,
                 "task_count": 0,
                 "success_count": 0,
                 "error_count": 0,
                 "total_response_time_ms": 0,
-                "last_health_check": datetime.now(),
-                "last_activity": datetime.now(),
-                "response_times": []
+                "last_health_check": now_ns,
+                "last_activity": now_ns,
+                # Fixed-size histogram instead of raw samples: O(1)
+                # records, constant memory, and quantiles on demand
+                "rt_hist": LogLinearHist(),
+                # Exponential bucket counters for threshold accounting
+                "rt_buckets": array.array('Q', bytes(8 * (len(BUCKETS_MS) + 1))),
+                # Derived metrics kept current by record_task_completion
+                # so health_check only reads them
+                "error_rate": 0.0,
+                "success_rate": 0.0,
+                "avg_response_time_ms": 0.0,
+                "slow_rate": 0.0,
+                "_dirty": True,
+                "_report": None,
+                "_report_at": 0.0
             }
     
     def record_task_completion(self, 
@@ -69,27 +159,52 @@ class ReliabilityMonitor:
         health = self.agent_health[agent_id]
         health["task_count"] += 1
         health["total_response_time_ms"] += response_time_ms
-        health["response_times"].append(response_time_ms)
-        health["last_activity"] = datetime.now()
-        
-        # Keep only last 100 response times
-        if len(health["response_times"]) > 100:
-            health["response_times"] = health["response_times"][-100:]
-        
+        health["rt_hist"].record(response_time_ms)
+        health["rt_buckets"][bisect.bisect_left(BUCKETS_MS, response_time_ms)] += 1
+        health["last_activity"] = time.monotonic_ns()
+
         if success:
             health["success_count"] += 1
         else:
             health["error_count"] += 1
-        
+
+        # One shared refresh of every derived metric, then alert checks
+        # that only read the cached values
+        self._recompute_metrics(health)
+        health["_dirty"] = True
+
         # Check for alerts
         self._check_alerts(agent_id)
+
+    def _recompute_metrics(self, health: Dict[str, Any]):
+        """Refresh the derived metrics and coarse status for an agent.
+
+        Called once per recorded task so health_check and _check_alerts
+        read cached fields instead of redoing the same divisions.
+        """
+        task_count = health["task_count"]
+        health["error_rate"] = error_rate = health["error_count"] / task_count
+        health["success_rate"] = health["success_count"] / task_count
+        health["avg_response_time_ms"] = health["total_response_time_ms"] / task_count
+        slow = sum(health["rt_buckets"][self._threshold_bucket:])
+        health["slow_rate"] = slow / task_count
+
+        # Keep the coarse status current here so status polling never has
+        # to run a full health_check
+        if error_rate > self.error_rate_threshold or health["avg_response_time_ms"] > self.response_time_threshold_ms:
+            health["status"] = HealthStatus.CRITICAL.value
+        elif error_rate > self.error_rate_threshold * 0.5:
+            health["status"] = HealthStatus.DEGRADED.value
+        else:
+            health["status"] = HealthStatus.HEALTHY.value
     
-    def health_check(self, agent_id: str) -> Dict[str, Any]:
+    def health_check(self, agent_id: str, _now_ns: Optional[int] = None) -> Dict[str, Any]:
         """
         Perform health check on agent.
         
         Args:
             agent_id: Agent ID
+            _now_ns: Shared clock reading when batched by run_health_sweep
             
         Returns:
             Health check result
@@ -98,17 +213,22 @@ class ReliabilityMonitor:
             self.register_agent(agent_id)
         
         health = self.agent_health[agent_id]
-        
-        # Calculate metrics
-        uptime_seconds = (datetime.now() - health["uptime_start"]).total_seconds()
+
+        # Serve the cached report while nothing changed and it is fresh
+        if (not health["_dirty"] and health["_report"] is not None
+                and time.monotonic() - health["_report_at"] < 1.0):
+            return health["_report"]
+
+        # Derived metrics are maintained incrementally by
+        # record_task_completion; only uptime needs the clock
+        now_ns = _now_ns if _now_ns is not None else time.monotonic_ns()
+        uptime_seconds = (now_ns - health["uptime_start"]) * 1e-9
         uptime_percent = (uptime_seconds / (uptime_seconds + health["error_count"] * 60)) * 100 if uptime_seconds > 0 else 100
-        
-        error_rate = (health["error_count"] / health["task_count"]) if health["task_count"] > 0 else 0
-        
-        avg_response_time = (health["total_response_time_ms"] / health["task_count"]) if health["task_count"] > 0 else 0
-        
-        success_rate = (health["success_count"] / health["task_count"]) if health["task_count"] > 0 else 0
-        
+
+        error_rate = health["error_rate"]
+        avg_response_time = health["avg_response_time_ms"]
+        success_rate = health["success_rate"]
+
         # Determine status
         if health["task_count"] == 0:
             status = HealthStatus.OFFLINE.value
@@ -120,89 +240,126 @@ class ReliabilityMonitor:
             status = HealthStatus.HEALTHY.value
         
         health["status"] = status
-        health["last_health_check"] = datetime.now()
-        
-        # Check last activity timeout
-        last_activity_seconds = (datetime.now() - health["last_activity"]).total_seconds()
-        if last_activity_seconds > self.health_check_timeout * 60:
+        health["last_health_check"] = now_ns
+
+        # Check last activity timeout — a plain integer subtract
+        if (now_ns - health["last_activity"]) * 1e-9 > self.health_check_timeout * 60:
             status = HealthStatus.OFFLINE.value
-        
+
         report = {
             "agent_id": agent_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _iso_from_ns(now_ns),
             "status": status,
             "metrics": {
                 "uptime_percent": round(uptime_percent, 2),
                 "task_success_rate": round(success_rate, 3),
                 "error_rate": round(error_rate, 3),
                 "avg_response_time_ms": round(avg_response_time, 1),
+                "p50_response_time_ms": round(health["rt_hist"].quantile(0.50), 1),
+                "p95_response_time_ms": round(health["rt_hist"].quantile(0.95), 1),
+                "p99_response_time_ms": round(health["rt_hist"].quantile(0.99), 1),
                 "total_tasks": health["task_count"],
                 "error_count": health["error_count"]
             },
-            "alerts": self.alerts.get(agent_id, [])
+            "alerts": list(self.alerts.get(agent_id, ()))
         }
         
-        # Store in history
+        # Store in history (bounded deque evicts the oldest report)
         if agent_id not in self.health_history:
-            self.health_history[agent_id] = []
-        
+            self.health_history[agent_id] = deque(maxlen=100)
+
         self.health_history[agent_id].append(report)
-        
-        # Keep only last 100 reports
-        if len(self.health_history[agent_id]) > 100:
-            self.health_history[agent_id] = self.health_history[agent_id][-100:]
-        
+
+        health["_dirty"] = False
+        health["_report"] = report
+        health["_report_at"] = time.monotonic()
+
         return report
     
     def _check_alerts(self, agent_id: str):
         """Check for alert conditions."""
         if agent_id not in self.alerts:
-            self.alerts[agent_id] = []
-        
+            self.alerts[agent_id] = deque(maxlen=20)
+
         health = self.agent_health[agent_id]
+        # One timestamp render shared by every alert raised this call,
+        # and none at all when nothing fires
+        now_iso = None
         
-        # Check error rate
+        # Check error rate (kept current by record_task_completion)
         if health["task_count"] > 0:
-            error_rate = health["error_count"] / health["task_count"]
+            error_rate = health["error_rate"]
             if error_rate > self.error_rate_threshold:
+                if now_iso is None:
+                    now_iso = datetime.now().isoformat()
                 self.alerts[agent_id].append({
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso,
                     "type": "HIGH_ERROR_RATE",
                     "value": round(error_rate, 3),
                     "threshold": self.error_rate_threshold
                 })
         
-        # Check response time
-        if health["response_times"]:
-            avg_response_time = sum(health["response_times"][-10:]) / len(health["response_times"][-10:])
-            if avg_response_time > self.response_time_threshold_ms:
+        # Slow-task fraction cached by _recompute_metrics from the
+        # exponential bucket counters
+        if health["task_count"] > 0:
+            slow_rate = health["slow_rate"]
+            if slow_rate > self.error_rate_threshold:
+                if now_iso is None:
+                    now_iso = datetime.now().isoformat()
                 self.alerts[agent_id].append({
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso,
                     "type": "SLOW_RESPONSE",
-                    "value": round(avg_response_time, 1),
-                    "threshold": self.response_time_threshold_ms
+                    "value": round(slow_rate, 3),
+                    "threshold": self.error_rate_threshold
                 })
         
-        # Keep only last 20 alerts
-        if len(self.alerts[agent_id]) > 20:
-            self.alerts[agent_id] = self.alerts[agent_id][-20:]
     
     def get_health_status(self, agent_id: str) -> str:
         """Get current health status."""
         report = self.health_check(agent_id)
         return report["status"]
     
-    def get_all_agents_status(self) -> Dict[str, str]:
-        """Get status of all monitored agents."""
+    def get_all_agents_status(self, full: bool = False) -> Dict[str, str]:
+        """
+        Get status of all monitored agents.
+
+        Args:
+            full: When True, run a full health check per agent; the
+                default reads the status field kept current by
+                record_task_completion — O(N) dict reads, no reports
+
+        Returns:
+            Mapping of agent ID to status string
+        """
+        if full:
+            return {
+                agent_id: self.get_health_status(agent_id)
+                for agent_id in self.agent_health.keys()
+            }
+        return {
+            agent_id: health["status"]
+            for agent_id, health in self.agent_health.items()
+        }
+
+    def run_health_sweep(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Run a full health check over every agent in one batch, sharing a
+        single clock reading (and thus one report timestamp) across the
+        sweep. Each agent gets one report appended to its history.
+
+        Returns:
+            Mapping of agent ID to health report
+        """
+        now_ns = time.monotonic_ns()
         return {
-            agent_id: self.get_health_status(agent_id)
+            agent_id: self.health_check(agent_id, _now_ns=now_ns)
             for agent_id in self.agent_health.keys()
         }
     
     def get_health_history(self, agent_id: str, last_n: int = 10) -> List[Dict[str, Any]]:
         """Get recent health history for an agent."""
-        history = self.health_history.get(agent_id, [])
-        return history[-last_n:] if history else []
+        history = self.health_history.get(agent_id)
+        return list(history)[-last_n:] if history else []
 
 
 # Example usage
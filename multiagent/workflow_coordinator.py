@@ -1,7 +1,27 @@
 from typing import Dict, List, Any, Optional
+from collections import Counter, deque
 from enum import Enum
 from datetime import datetime
-import uuid
+import heapq
+import itertools
+import time
+
+# Wall-clock anchor so monotonic nanosecond timestamps can be rendered
+# as ISO strings at serialization time only
+_WALL_OFFSET = time.time() - time.monotonic()
+
+
+def _iso_from_ns(ns: Optional[int]) -> Optional[str]:
+    """Render a monotonic-ns timestamp as a wall-clock ISO string."""
+    if ns is None:
+        return None
+    return datetime.fromtimestamp(ns * 1e-9 + _WALL_OFFSET).isoformat()
+
+
+# Workflow IDs pair a creation-time nanosecond stamp (unique across
+# processes in practice) with a process-local counter, avoiding a
+# strftime plus urandom-backed uuid4 per workflow
+_wf_counter = itertools.count()
 
 class TaskStatus(Enum):
     """Task status in workflow."""
@@ -18,8 +38,25 @@ class WorkflowStatus(Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
+
+# Status strings resolved once: each Enum.MEMBER.value is a descriptor
+# lookup plus attribute fetch, which adds up in the scheduler hot paths
+_PENDING = TaskStatus.PENDING.value
+_IN_PROGRESS = TaskStatus.IN_PROGRESS.value
+_COMPLETED = TaskStatus.COMPLETED.value
+_FAILED = TaskStatus.FAILED.value
+_BLOCKED = TaskStatus.BLOCKED.value
+_WF_CREATED = WorkflowStatus.CREATED.value
+_WF_IN_PROGRESS = WorkflowStatus.IN_PROGRESS.value
+
 class WorkflowTask:
     """Represents a task in a workflow."""
+
+    # No per-instance __dict__: workflows carry one of these per step,
+    # so the fixed slot layout keeps large workflows compact
+    __slots__ = ('step', 'agent_id', 'description', 'dependencies',
+                 'status', 'result', 'error', 'created_at', 'started_at',
+                 'completed_at', '_created_iso')
     
     def __init__(self, 
                  step: int, 
@@ -39,15 +76,21 @@ class WorkflowTask:
         self.agent_id = agent_id
         self.description = description
         self.dependencies = dependencies or []
-        self.status = TaskStatus.PENDING.value
+        self.status = _PENDING
         self.result = None
         self.error = None
-        self.created_at = datetime.now()
+        self.created_at = time.monotonic_ns()
         self.started_at = None
         self.completed_at = None
+        # created_at never changes, so its ISO string is rendered once
+        # on first serialization and reused afterwards
+        self._created_iso = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
+        created = self._created_iso
+        if created is None:
+            created = self._created_iso = _iso_from_ns(self.created_at)
         return {
             "step": self.step,
             "agent_id": self.agent_id,
@@ -56,11 +99,16 @@ class WorkflowTask:
             "status": self.status,
             "result": self.result,
             "error": self.error,
-            "created_at": self.created_at.isoformat()
+            "created_at": created
         }
 
 class Workflow:
     """Multi-step workflow coordination."""
+
+    __slots__ = ('workflow_id', 'name', 'tasks', '_reverse_deps',
+                 '_pending_deps', '_ready', 'status', 'created_at',
+                 'started_at', 'completed_at', '_created_iso',
+                 '_status_counts')
     
     def __init__(self, name: str):
         """
@@ -69,13 +117,24 @@ class Workflow:
         Args:
             name: Workflow name
         """
-        self.workflow_id = f"wf_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        self.workflow_id = f"wf_{time.time_ns():x}_{next(_wf_counter):04x}"
         self.name = name
         self.tasks: Dict[int, WorkflowTask] = {}
-        self.status = WorkflowStatus.CREATED.value
-        self.created_at = datetime.now()
+        # Incremental DAG-scheduling state: dependents of each step, the
+        # number of unmet dependencies per step, and a min-heap of steps
+        # whose dependencies are all satisfied (lazily validated on read)
+        self._reverse_deps: Dict[int, List[int]] = {}
+        self._pending_deps: Dict[int, int] = {}
+        self._ready: List[int] = []
+        self.status = _WF_CREATED
+        self.created_at = time.monotonic_ns()
         self.started_at = None
         self.completed_at = None
+        # Memoized ISO rendering of the immutable creation time
+        self._created_iso = None
+        # Running per-status tallies kept current on every transition so
+        # get_progress and is_completed never rescan the task table
+        self._status_counts: Counter = Counter()
     
     def add_task(self, 
                  step: int, 
@@ -96,6 +155,27 @@ class Workflow:
         """
         task = WorkflowTask(step, agent_id, description, dependencies)
         self.tasks[step] = task
+        self._status_counts[task.status] += 1
+
+        # Count unmet dependencies; steps referenced before being added
+        # are ignored until they appear, matching the scan semantics
+        unmet = 0
+        for dep in task.dependencies:
+            self._reverse_deps.setdefault(dep, []).append(step)
+            dep_task = self.tasks.get(dep)
+            if dep_task is not None and dep_task.status != _COMPLETED:
+                unmet += 1
+        self._pending_deps[step] = unmet
+
+        # This step is itself a new unmet dependency for anything that
+        # declared it in advance
+        for dependent in self._reverse_deps.get(step, ()):
+            if dependent != step and dependent in self._pending_deps:
+                self._pending_deps[dependent] += 1
+
+        if unmet == 0:
+            heapq.heappush(self._ready, step)
+
         return task
     
     def get_next_executable_task(self) -> Optional[WorkflowTask]:
@@ -105,23 +185,16 @@ class Workflow:
         Returns:
             Task or None if none available
         """
-        for step in sorted(self.tasks.keys()):
-            task = self.tasks[step]
-            
-            # Check if task is pending
-            if task.status != TaskStatus.PENDING.value:
-                continue
-            
-            # Check if all dependencies are completed
-            all_deps_completed = all(
-                self.tasks[dep].status == TaskStatus.COMPLETED.value
-                for dep in task.dependencies
-                if dep in self.tasks
-            )
-            
-            if all_deps_completed:
+        # Peek the ready heap, lazily discarding entries that went stale
+        # (started, completed, blocked, or re-gated by a late-added dep)
+        while self._ready:
+            step = self._ready[0]
+            task = self.tasks.get(step)
+            if (task is not None and task.status == _PENDING
+                    and self._pending_deps.get(step, 0) == 0):
                 return task
-        
+            heapq.heappop(self._ready)
+
         return None
     
     def start_task(self, step: int) -> bool:
@@ -138,12 +211,13 @@ class Workflow:
             return False
         
         task = self.tasks[step]
-        task.status = TaskStatus.IN_PROGRESS.value
-        task.started_at = datetime.now()
+        self._retally(task.status, _IN_PROGRESS)
+        task.status = _IN_PROGRESS
+        task.started_at = time.monotonic_ns()
         
-        if self.status == WorkflowStatus.CREATED.value:
-            self.status = WorkflowStatus.IN_PROGRESS.value
-            self.started_at = datetime.now()
+        if self.status == _WF_CREATED:
+            self.status = _WF_IN_PROGRESS
+            self.started_at = task.started_at
         
         return True
     
@@ -162,10 +236,22 @@ class Workflow:
             return False
         
         task = self.tasks[step]
-        task.status = TaskStatus.COMPLETED.value
+        first_completion = task.status != _COMPLETED
+        self._retally(task.status, _COMPLETED)
+        task.status = _COMPLETED
         task.result = result
-        task.completed_at = datetime.now()
-        
+        task.completed_at = time.monotonic_ns()
+
+        # Unblock dependents whose last unmet dependency this was
+        if first_completion:
+            for dependent in self._reverse_deps.get(step, ()):
+                count = self._pending_deps.get(dependent)
+                if count:
+                    count -= 1
+                    self._pending_deps[dependent] = count
+                    if count == 0 and self.tasks[dependent].status == _PENDING:
+                        heapq.heappush(self._ready, dependent)
+
         return True
     
     def fail_task(self, step: int, error: str) -> bool:
@@ -183,22 +269,38 @@ class Workflow:
             return False
         
         task = self.tasks[step]
-        task.status = TaskStatus.FAILED.value
+        self._retally(task.status, _FAILED)
+        task.status = _FAILED
         task.error = error
-        task.completed_at = datetime.now()
-        
-        # Fail dependent tasks
-        for other_step, other_task in self.tasks.items():
-            if step in other_task.dependencies and other_task.status == TaskStatus.PENDING.value:
-                other_task.status = TaskStatus.BLOCKED.value
-        
+        task.completed_at = time.monotonic_ns()
+
+        # Block everything transitively downstream with one BFS over the
+        # reverse-dependency index
+        queue = deque(self._reverse_deps.get(step, ()))
+        while queue:
+            dependent = queue.popleft()
+            dependent_task = self.tasks.get(dependent)
+            if dependent_task is not None and dependent_task.status == _PENDING:
+                self._retally(_PENDING, _BLOCKED)
+                dependent_task.status = _BLOCKED
+                queue.extend(self._reverse_deps.get(dependent, ()))
+
         return True
     
+    def _retally(self, old: str, new: str):
+        """Adjust the running status tallies for one task transition."""
+        if old != new:
+            counts = self._status_counts
+            counts[old] -= 1
+            counts[new] += 1
+
     def get_progress(self) -> Dict[str, Any]:
         """Get workflow progress."""
-        completed = sum(1 for t in self.tasks.values() if t.status == TaskStatus.COMPLETED.value)
-        failed = sum(1 for t in self.tasks.values() if t.status == TaskStatus.FAILED.value)
-        in_progress = sum(1 for t in self.tasks.values() if t.status == TaskStatus.IN_PROGRESS.value)
+        # O(1) reads of the tallies maintained on each transition
+        counts = self._status_counts
+        completed = counts[_COMPLETED]
+        failed = counts[_FAILED]
+        in_progress = counts[_IN_PROGRESS]
         total = len(self.tasks)
         
         return {
@@ -218,18 +320,22 @@ class Workflow:
         if not self.tasks:
             return False
         
-        return all(
-            t.status in [TaskStatus.COMPLETED.value, TaskStatus.FAILED.value]
-            for t in self.tasks.values()
-        )
+        # Terminal tallies are maintained on every transition, so this
+        # is a pair of dict reads rather than a full scan
+        counts = self._status_counts
+        terminal = counts[_COMPLETED] + counts[_FAILED]
+        return terminal == len(self.tasks)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert workflow to dictionary."""
+        created = self._created_iso
+        if created is None:
+            created = self._created_iso = _iso_from_ns(self.created_at)
         return {
             "workflow_id": self.workflow_id,
             "name": self.name,
             "status": self.status,
-            "created_at": self.created_at.isoformat(),
+            "created_at": created,
             "tasks": {step: task.to_dict() for step, task in self.tasks.items()},
             "progress": self.get_progress()
         }
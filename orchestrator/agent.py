@@ -1,13 +1,29 @@
 from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
-import uuid
+import itertools
+import time
 import json
 
+# Wall-clock anchor so monotonic nanosecond timestamps can be rendered
+# as ISO strings without a clock read per status call
+_WALL_OFFSET = time.time() - time.monotonic()
+
+# Process-local ID source: a counter increment and hex format instead of
+# an os.urandom read plus 32-char formatting per agent
+_agent_counter = itertools.count()
+
 class Agent:
     """
     Base Agent class. All agents inherit from this.
     Defines common behavior and interface for all agents.
     """
+
+    # Fleets create many agents; slots drop the per-instance __dict__
+    # and make attribute access an offset load
+    __slots__ = ('agent_id', 'agent_type', 'name', 'capabilities',
+                 'prompt', 'status', 'created_at', '_created_iso',
+                 '_last_activity_iso', 'last_activity', 'task_count',
+                 'error_count', 'metadata', '_caps_lower', '_cap_count')
     
     def __init__(self, 
                  agent_type: str, 
@@ -23,37 +39,57 @@ class Agent:
             capabilities: List of capabilities this agent has
             prompt: System prompt for LLM
         """
-        self.agent_id = f"agent_{uuid.uuid4().hex[:8]}"
+        self.agent_id = f"agent_{next(_agent_counter):08x}"
         self.agent_type = agent_type
         self.name = name
         self.capabilities = capabilities
+        # Lowercased once at construction so dispatch never re-lowercases
+        # the same capability strings per scoring call
+        self._caps_lower = tuple(c.lower() for c in capabilities)
+        self._cap_count = len(capabilities)
         self.prompt = prompt
         self.status = "initializing"
         self.created_at = datetime.now()
-        self.last_activity = datetime.now()
+        # Memoized ISO strings: created_at is immutable; the
+        # last-activity rendering is invalidated whenever it moves
+        self._created_iso = None
+        self._last_activity_iso = None
+        # Monotonic ns: updated on every task, so keep it allocation-free
+        self.last_activity = time.monotonic_ns()
         self.task_count = 0
         self.error_count = 0
         self.metadata = {}
     
-    def can_handle_task(self, task_description: str) -> float:
+    def can_handle_task(self,
+                        task_description: str,
+                        tokens: Optional[frozenset] = None) -> float:
         """
         Check if agent can handle a task and return confidence score.
         
         Args:
             task_description: Description of the task
+            tokens: Optional pre-tokenized description; when given,
+                capability matching is a set-membership test per
+                capability instead of a substring scan
             
         Returns:
             Confidence score (0-1)
         """
         # Simple keyword matching for now
-        task_lower = task_description.lower()
-        matched_capabilities = sum(
-            1 for cap in self.capabilities 
-            if cap.lower() in task_lower
-        )
+        if tokens is not None:
+            matched_capabilities = sum(
+                1 for cap in self._caps_lower
+                if cap in tokens
+            )
+        else:
+            task_lower = task_description.lower()
+            matched_capabilities = sum(
+                1 for cap in self._caps_lower
+                if cap in task_lower
+            )
         
         if matched_capabilities > 0:
-            return min(matched_capabilities / len(self.capabilities), 1.0)
+            return min(matched_capabilities / self._cap_count, 1.0)
         
         return 0.0
     
@@ -68,7 +104,8 @@ class Agent:
             Task result
         """
         self.status = "processing"
-        self.last_activity = datetime.now()
+        self.last_activity = time.monotonic_ns()
+        self._last_activity_iso = None
         self.task_count += 1
         
         try:
@@ -98,6 +135,10 @@ class Agent:
     
     def get_status(self) -> Dict[str, Any]:
         """Get agent status."""
+        last_activity = self._last_activity_iso
+        if last_activity is None:
+            last_activity = self._last_activity_iso = datetime.fromtimestamp(
+                self.last_activity * 1e-9 + _WALL_OFFSET).isoformat()
         return {
             "agent_id": self.agent_id,
             "agent_type": self.agent_type,
@@ -106,18 +147,21 @@ class Agent:
             "capabilities": self.capabilities,
             "task_count": self.task_count,
             "error_count": self.error_count,
-            "last_activity": self.last_activity.isoformat()
+            "last_activity": last_activity
         }
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert agent to dictionary."""
+        created = self._created_iso
+        if created is None:
+            created = self._created_iso = self.created_at.isoformat()
         return {
             "agent_id": self.agent_id,
             "agent_type": self.agent_type,
             "name": self.name,
             "capabilities": self.capabilities,
             "status": self.status,
-            "created_at": self.created_at.isoformat()
+            "created_at": created
         }
 
 
@@ -125,6 +169,8 @@ class SupervisorAgent(Agent):
     """
     Supervisor Agent: Decomposes tasks and delegates to workers.
     """
+
+    __slots__ = ('delegated_tasks',)
     
     def __init__(self, name: str = "Supervisor", prompt: str = ""):
         super().__init__(
@@ -162,6 +208,8 @@ class WorkerAgent(Agent):
     """
     Worker Agent: Executes tasks using prompts and tools.
     """
+
+    __slots__ = ('worker_type',)
     
     def __init__(self, 
                  worker_type: str = "generic", 
@@ -187,6 +235,8 @@ class EvaluatorAgent(Agent):
     """
     Evaluator Agent: Quality checks and scores work.
     """
+
+    __slots__ = ()
     
     def __init__(self, name: str = "Evaluator", prompt: str = ""):
         super().__init__(
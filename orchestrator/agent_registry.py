@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+import heapq
 from .agent import Agent, SupervisorAgent, WorkerAgent, EvaluatorAgent
 
 class AgentRegistry:
@@ -9,7 +10,14 @@ class AgentRegistry:
     def __init__(self):
         """Initialize the agent registry."""
         self.agents: Dict[str, Agent] = {}
-        self.agents_by_type: Dict[str, List[str]] = {}
+        # Sets make per-type membership churn O(1) instead of list.remove
+        self.agents_by_type: Dict[str, Set[str]] = {}
+        # Inverted index: lowercased capability -> agent ids, so dispatch
+        # only scores agents whose capabilities appear in the task
+        self._cap_index: Dict[str, Set[str]] = {}
+        # Least-busy heaps of [task_count, agent_id] per type (None holds
+        # the all-agents heap); entries are validated lazily at peek time
+        self._busy_heap: Dict[Optional[str], List[list]] = {}
     
     def register_agent(self, agent: Agent) -> str:
         """
@@ -25,12 +33,15 @@ class AgentRegistry:
         self.agents[agent_id] = agent
         
         # Index by type
-        agent_type = agent.agent_type
-        if agent_type not in self.agents_by_type:
-            self.agents_by_type[agent_type] = []
-        
-        self.agents_by_type[agent_type].append(agent_id)
-        
+        self.agents_by_type.setdefault(agent.agent_type, set()).add(agent_id)
+
+        for cap in agent.capabilities:
+            self._cap_index.setdefault(cap.lower(), set()).add(agent_id)
+
+        entry = [agent.task_count, agent_id]
+        heapq.heappush(self._busy_heap.setdefault(agent.agent_type, []), entry)
+        heapq.heappush(self._busy_heap.setdefault(None, []), list(entry))
+
         return agent_id
     
     def unregister_agent(self, agent_id: str) -> bool:
@@ -53,11 +64,20 @@ class AgentRegistry:
         del self.agents[agent_id]
         
         # Remove from type index
-        if agent_type in self.agents_by_type:
-            self.agents_by_type[agent_type].remove(agent_id)
-            if not self.agents_by_type[agent_type]:
+        type_agents = self.agents_by_type.get(agent_type)
+        if type_agents is not None:
+            type_agents.discard(agent_id)
+            if not type_agents:
                 del self.agents_by_type[agent_type]
-        
+
+        # Drop from the capability index
+        for cap in agent.capabilities:
+            cap_agents = self._cap_index.get(cap.lower())
+            if cap_agents is not None:
+                cap_agents.discard(agent_id)
+                if not cap_agents:
+                    del self._cap_index[cap.lower()]
+
         return True
     
     def get_agent(self, agent_id: str) -> Optional[Agent]:
@@ -82,30 +102,74 @@ class AgentRegistry:
         Returns:
             List of agents
         """
-        agent_ids = self.agents_by_type.get(agent_type, [])
+        agent_ids = self.agents_by_type.get(agent_type, ())
         return [self.agents[aid] for aid in agent_ids]
     
-    def find_best_agent(self, task_description: str) -> Tuple[Optional[Agent], float]:
+    def peek_least_busy(self, agent_type: Optional[str] = None) -> Optional[Agent]:
+        """
+        Get the agent with the lowest task count, O(1) in the common
+        case.
+        
+        Args:
+            agent_type: Optional filter by agent type
+            
+        Returns:
+            Least busy agent or None
+        """
+        heap = self._busy_heap.get(agent_type)
+        while heap:
+            count, agent_id = heap[0]
+            agent = self.agents.get(agent_id)
+            if agent is None:
+                # Unregistered agents are discarded lazily here
+                heapq.heappop(heap)
+            elif count != agent.task_count:
+                # Stale count: re-sink the entry with the current value
+                heapq.heapreplace(heap, [agent.task_count, agent_id])
+            else:
+                return agent
+        return None
+
+    def find_best_agent(self,
+                        task_description: str,
+                        tokens: Optional[frozenset] = None) -> Tuple[Optional[Agent], float]:
         """
         Find the best agent to handle a task.
         Uses capability matching and confidence scoring.
         
         Args:
             task_description: Description of the task
+            tokens: Optional pre-tokenized description (see router); when
+                given, candidate lookup and scoring are set operations
             
         Returns:
             Tuple of (best_agent, confidence_score)
         """
+        # Collect only the agents owning a capability that appears in
+        # the task; everyone else would score 0.0 anyway
+        candidates: Set[str] = set()
+        if tokens is not None:
+            # Capability keys intersected with the token set: pure hash
+            # work, no substring scans
+            for cap in self._cap_index.keys() & tokens:
+                candidates.update(self._cap_index[cap])
+        else:
+            task_lower = task_description.lower()
+            for cap, agent_ids in self._cap_index.items():
+                if cap in task_lower:
+                    candidates.update(agent_ids)
+
         best_agent = None
         best_score = 0.0
-        
-        for agent in self.agents.values():
-            score = agent.can_handle_task(task_description)
-            
+
+        for agent_id in candidates:
+            agent = self.agents[agent_id]
+            score = agent.can_handle_task(task_description, tokens=tokens)
+
             if score > best_score:
                 best_score = score
                 best_agent = agent
-        
+
         return best_agent, best_score
     
     def get_all_agents(self) -> List[Agent]:
@@ -116,17 +180,38 @@ class AgentRegistry:
         """Get total number of registered agents."""
         return len(self.agents)
     
-    def get_registry_status(self) -> Dict[str, any]:
-        """Get overall registry status."""
+    def get_registry_summary(self) -> Dict[str, any]:
+        """
+        Get registry counts only — the cheap default for liveness and
+        polling paths that don't need per-agent serialization.
+        
+        Returns:
+            Totals and per-type counts
+        """
         return {
             "total_agents": len(self.agents),
             "by_type": {
                 agent_type: len(agent_ids)
                 for agent_type, agent_ids in self.agents_by_type.items()
-            },
-            "agents": [agent.to_dict() for agent in self.agents.values()]
+            }
         }
 
+    def get_registry_status(self, full: bool = True) -> Dict[str, any]:
+        """
+        Get overall registry status.
+        
+        Args:
+            full: When False, return counts only (see
+                get_registry_summary) without serializing every agent
+        
+        Returns:
+            Registry status report
+        """
+        status = self.get_registry_summary()
+        if full:
+            status["agents"] = [agent.to_dict() for agent in self.agents.values()]
+        return status
+
 
 # Example usage
 if __name__ == "__main__":
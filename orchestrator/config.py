@@ -1,11 +1,27 @@
+import copy
 import json
 import os
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional
+
+
+@lru_cache(maxsize=8)
+def _load_json(path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a config file once per (path, mtime) pair.
+
+    The mtime key makes the cache self-invalidating: an edited file gets
+    a fresh parse, an unchanged one is served from memory.
+    """
+    with open(path, 'r') as f:
+        return json.load(f)
+
 
 class OrchestratorConfig:
     """
     Load and manage orchestrator configuration.
     """
+
+    __slots__ = ('config_path', 'config', '_flat', '_last_hash', '_mtime')
     
     def __init__(self, config_path: str = "orchestrator_config.json"):
         """
@@ -16,15 +32,31 @@ class OrchestratorConfig:
         """
         self.config_path = config_path
         self.config = self._load_config()
+        # Resolved dot-key cache: get() walks the nested dicts once per
+        # distinct key instead of splitting and descending on every call
+        self._flat: Dict[str, Any] = {}
+        # Hash of the last payload written by save(), for no-op skips
+        self._last_hash: Optional[int] = None
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from JSON file."""
         if os.path.exists(self.config_path):
-            with open(self.config_path, 'r') as f:
-                return json.load(f)
+            self._mtime = os.path.getmtime(self.config_path)
+            # Deep-copy the cached parse so instances can mutate their
+            # config without bleeding into each other; copying a small
+            # dict is far cheaper than re-reading and re-parsing the file
+            return copy.deepcopy(_load_json(self.config_path, self._mtime))
         else:
             # Return defaults if file not found
+            self._mtime = None
             return self._get_defaults()
+
+    def reload(self) -> None:
+        """Re-read the config file if it changed on disk."""
+        if (os.path.exists(self.config_path)
+                and os.path.getmtime(self.config_path) != self._mtime):
+            self.config = self._load_config()
+            self._flat.clear()
     
     def _get_defaults(self) -> Dict[str, Any]:
         """Return default configuration."""
@@ -51,6 +83,10 @@ class OrchestratorConfig:
         Returns:
             Configuration value
         """
+        if key in self._flat:
+            value = self._flat[key]
+            return value if value is not None else default
+
         keys = key.split('.')
         value = self.config
         
@@ -58,8 +94,10 @@ class OrchestratorConfig:
             if isinstance(value, dict):
                 value = value.get(k)
             else:
-                return default
+                value = None
+                break
         
+        self._flat[key] = value
         return value if value is not None else default
     
     def set(self, key: str, value: Any) -> None:
@@ -79,15 +117,31 @@ class OrchestratorConfig:
             config = config[k]
         
         config[keys[-1]] = value
+        # Any write may shadow previously resolved keys
+        self._flat.clear()
     
     def to_dict(self) -> Dict[str, Any]:
         """Return full configuration as dictionary."""
         return self.config
     
     def save(self) -> None:
-        """Save configuration to file."""
-        with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        """Save configuration to file.
+
+        Unchanged configs are skipped entirely, and changed ones are
+        written to a temp file and renamed into place so readers never
+        see a partial write.
+        """
+        payload = json.dumps(self.config, separators=(',', ':'))
+        payload_hash = hash(payload)
+        if payload_hash == self._last_hash:
+            return
+
+        tmp_path = self.config_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(payload)
+        os.replace(tmp_path, self.config_path)
+        self._last_hash = payload_hash
+        self._mtime = os.path.getmtime(self.config_path)
 
 
 # Global config instance
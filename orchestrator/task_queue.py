@@ -1,10 +1,22 @@
 from typing import Dict, List, Optional, Any
-from collections import deque
+from collections import OrderedDict, deque
 from datetime import datetime
-import uuid
+import heapq
+import itertools
+
+# Per-process task ID source: a counter tick replaces the per-task
+# uuid4 entropy draw and strftime formatting
+_task_counter = itertools.count()
+
 
 class Task:
     """Represents a single task."""
+
+    # One instance per enqueue: slots drop the per-task __dict__ and
+    # make the status stores in dequeue direct slot writes
+    __slots__ = ('task_id', 'description', 'priority', 'deadline',
+                 'status', 'created_at', 'assigned_agent', 'result',
+                 '_dict_cache')
     
     def __init__(self, 
                  description: str, 
@@ -18,31 +30,54 @@ class Task:
             priority: Priority level (low, medium, high, critical)
             deadline: Optional deadline
         """
-        self.task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        # One clock read serves both the ID and created_at; the counter
+        # suffix keeps IDs unique and monotonically sortable in-process
+        now = datetime.now()
+        self.task_id = f"task_{now.timestamp():.0f}_{next(_task_counter):x}"
         self.description = description
         self.priority = priority
         self.deadline = deadline
         self.status = "pending"
-        self.created_at = datetime.now()
+        self.created_at = now
         self.assigned_agent = None
         self.result = None
+        # Serialized form built lazily once; only the mutable fields are
+        # refreshed on later calls
+        self._dict_cache = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert task to dictionary."""
-        return {
-            "task_id": self.task_id,
-            "description": self.description,
-            "priority": self.priority,
-            "status": self.status,
-            "assigned_agent": self.assigned_agent,
-            "created_at": self.created_at.isoformat()
-        }
+        cache = self._dict_cache
+        if cache is None:
+            cache = self._dict_cache = {
+                "task_id": self.task_id,
+                "description": self.description,
+                "priority": self.priority,
+                "status": self.status,
+                "assigned_agent": self.assigned_agent,
+                "created_at": self.created_at.isoformat()
+            }
+        else:
+            # Everything else is immutable after construction
+            cache["status"] = self.status
+            cache["assigned_agent"] = self.assigned_agent
+        return cache
+
+
+# Reverse mapping of TaskQueue._RANK for count bookkeeping on pop
+_RANK_NAMES = ("critical", "high", "medium", "low")
 
 
 class TaskQueue:
     """
     Manages task queue with priority levels.
     """
+
+    # Lower rank pops first; unknown priorities fall back to medium
+    _RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+    # Terminal (completed/failed) tasks retained for result lookup
+    _TERMINAL_KEEP = 100
     
     def __init__(self, max_size: int = 100):
         """
@@ -52,13 +87,20 @@ class TaskQueue:
             max_size: Maximum queue size
         """
         self.max_size = max_size
-        self.priority_queues = {
-            "critical": deque(),
-            "high": deque(),
-            "medium": deque(),
-            "low": deque()
-        }
-        self.task_history: Dict[str, Task] = {}
+        # Single heap keyed (priority rank, sequence): one O(log n) push
+        # or pop per operation, FIFO within a priority level, plus O(1)
+        # size and per-priority counts maintained alongside
+        self._heap: List[tuple] = []
+        self._seq = 0
+        self._size = 0
+        self._counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
+        # Bounded history: FIFO-capped overall, and tasks that reach a
+        # terminal state are dropped once the last _TERMINAL_KEEP of
+        # them have passed — long-running queues no longer retain every
+        # task ever enqueued
+        self.task_history: "OrderedDict[str, Task]" = OrderedDict()
+        self._max_history = 4 * max_size
+        self._terminal_ring: deque = deque()
     
     def enqueue(self, task: Task) -> bool:
         """
@@ -70,17 +112,30 @@ class TaskQueue:
         Returns:
             True if successful
         """
-        if self.get_queue_size() >= self.max_size:
+        if self._size >= self.max_size:
             return False
         
         priority = task.priority
-        if priority not in self.priority_queues:
+        if priority not in self._RANK:
             priority = "medium"
         
-        self.priority_queues[priority].append(task)
+        heapq.heappush(self._heap, (self._RANK[priority], self._seq, task))
+        self._seq += 1
+        self._size += 1
+        self._counts[priority] += 1
         self.task_history[task.task_id] = task
+        self.task_history.move_to_end(task.task_id)
+        if len(self.task_history) > self._max_history:
+            self.task_history.popitem(last=False)
         
         return True
+
+    def _retire(self, task_id: str):
+        """Keep only the most recent terminal tasks in the history."""
+        ring = self._terminal_ring
+        ring.append(task_id)
+        if len(ring) > self._TERMINAL_KEEP:
+            self.task_history.pop(ring.popleft(), None)
     
     def dequeue(self) -> Optional[Task]:
         """
@@ -89,28 +144,44 @@ class TaskQueue:
         Returns:
             Next task or None if queue empty
         """
-        # Check priority queues in order
-        for priority in ["critical", "high", "medium", "low"]:
-            if self.priority_queues[priority]:
-                task = self.priority_queues[priority].popleft()
-                task.status = "assigned"
-                return task
+        if self._size == 0:
+            return None
+
+        rank, _, task = heapq.heappop(self._heap)
+        self._size -= 1
+        self._counts[_RANK_NAMES[rank]] -= 1
+        task.status = "assigned"
+        return task
+
+    def dequeue_batch(self, n: int) -> List[Task]:
+        """
+        Pop up to n tasks in one call, highest priority first.
         
-        return None
+        Args:
+            n: Maximum tasks to pop
+            
+        Returns:
+            List of tasks (may be empty)
+        """
+        count = min(n, self._size)
+        heap = self._heap
+        counts = self._counts
+        batch = []
+        for _ in range(count):
+            rank, _, task = heapq.heappop(heap)
+            counts[_RANK_NAMES[rank]] -= 1
+            task.status = "assigned"
+            batch.append(task)
+        self._size -= count
+        return batch
     
     def get_queue_size(self) -> int:
         """Get total number of pending tasks."""
-        total = 0
-        for queue in self.priority_queues.values():
-            total += len(queue)
-        return total
+        return self._size
     
     def get_queue_status(self) -> Dict[str, int]:
         """Get status of all queues."""
-        return {
-            priority: len(queue)
-            for priority, queue in self.priority_queues.items()
-        }
+        return dict(self._counts)
     
     def complete_task(self, task_id: str, result: Any) -> bool:
         """
@@ -129,6 +200,7 @@ class TaskQueue:
         task = self.task_history[task_id]
         task.status = "completed"
         task.result = result
+        self._retire(task_id)
         
         return True
     
@@ -149,6 +221,7 @@ class TaskQueue:
         task = self.task_history[task_id]
         task.status = "failed"
         task.result = error
+        self._retire(task_id)
         
         return True
 
@@ -1,9 +1,160 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from collections import Counter, deque
+from dataclasses import dataclass, field
 from datetime import datetime
+import math
+import numpy as np
 from .privacy_checker import PrivacyChecker
 from .security_scanner import SecurityScanner
 import json
 
+# JSON encoding goes through orjson (C encoder, fast number formatting)
+# when installed, with the stdlib as fallback — logging and audit
+# pipelines serialize every assessment they persist
+try:
+    import orjson
+
+    HAVE_ORJSON = True
+
+    def _dumps(obj) -> str:
+        """Serialize obj to a compact JSON string via orjson."""
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    HAVE_ORJSON = False
+
+    def _dumps(obj) -> str:
+        """Stdlib fallback matching orjson's compact output."""
+        return json.dumps(obj, separators=(",", ":"))
+
+# Default dimension weights (privacy, security) for the combined score,
+# as a vector so aggregation is one matrix-vector product. Deployments
+# can override via RiskEngine.dimension_weights, e.g. a safety-priority
+# profile that weights security harder
+_RISK_WEIGHTS = np.array([0.4, 0.6])
+
+_ACTION_REASONS = {
+    "BLOCK": "Risk score exceeds critical threshold",
+    "ESCALATE": "High risk - requires supervisor review",
+    "ALLOW_WITH_LOGGING": "Elevated risk - monitor and log",
+    "ALLOW": "Risk within acceptable limits",
+}
+
+
+# Combiner specialized once per weight profile: the gamma arithmetic
+# compiles to straight scalar multiply-adds with the weights and their
+# normalizers inlined as constants, so the per-request path pays no
+# array construction or attribute lookups (same specialization move as
+# the generated serializer in multiagent/message.py)
+_COMBINE_SRC = '''\
+def _combine(p, s):
+    """gamma, gamma_norm, sigma2 for one (privacy, security) pair."""
+    sp = p * 0.01
+    ss = s * 0.01
+    gamma = sp * {u0!r} + ss * {u1!r}
+    s_bar = gamma * {inv_sum!r}
+    sigma2 = ({u0!r} * (sp - s_bar) ** 2
+              + {u1!r} * (ss - s_bar) ** 2) * {inv_sum!r}
+    return gamma, gamma * {norm!r}, sigma2
+'''
+
+
+def _compile_combine(weights):
+    """Build a combiner specialized for the given 2-dim weight vector."""
+    u0, u1 = (float(w) for w in weights)
+    u_sum = u0 + u1
+    src = _COMBINE_SRC.format(u0=u0, u1=u1, inv_sum=1.0 / u_sum,
+                              norm=100.0 / u_sum)
+    ns = {}
+    exec(compile(src, "<risk_combine>", "exec"), ns)
+    return ns["_combine"]
+
+
+@dataclass(slots=True)
+class Assessment:
+    """One risk assessment record.
+
+    A slotted instance is markedly smaller and faster to build than the
+    10-key dict it replaces; history stores these and the dict shape is
+    produced only at the public API boundary via to_dict().
+    """
+    request_id: str = ""
+    timestamp: str = ""
+    risk_score: float = 0.0
+    risk_components: Dict[str, Any] = field(default_factory=dict)
+    privacy_findings: List[Dict[str, Any]] = field(default_factory=list)
+    security_findings: List[Dict[str, Any]] = field(default_factory=list)
+    action: str = "ALLOW"
+    reason: str = ""
+    approved: bool = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to the report shape returned by the public API."""
+        return {
+            "request_id": self.request_id,
+            "timestamp": self.timestamp,
+            "risk_score": self.risk_score,
+            "risk_components": self.risk_components,
+            "privacy_findings": self.privacy_findings,
+            "security_findings": self.security_findings,
+            "action": self.action,
+            "reason": self.reason,
+            "approved": self.approved
+        }
+
+    def to_json(self) -> str:
+        """Serialize directly to JSON for logging/audit sinks, skipping
+        any intermediate per-layer dumps."""
+        return _dumps(self.to_dict())
+
+    def _reset(self, request_id, timestamp, risk_score, risk_components,
+               privacy_findings, security_findings, action, reason,
+               approved):
+        """Reinitialize a recycled shell in place (see _AssessmentPool)."""
+        self.request_id = request_id
+        self.timestamp = timestamp
+        self.risk_score = risk_score
+        self.risk_components = risk_components
+        self.privacy_findings = privacy_findings
+        self.security_findings = security_findings
+        self.action = action
+        self.reason = reason
+        self.approved = approved
+
+
+class _AssessmentPool:
+    """
+    Bounded freelist of Assessment shells.
+    Under bursty traffic every assessment past the history cap evicts
+    an older one; recycling the evicted shell avoids a fresh allocation
+    per request (same pattern as the broker's MessagePool). Only the
+    shell is reused — the findings lists and component dicts it pointed
+    at stay with whatever report dicts callers still hold.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        Initialize the pool.
+
+        Args:
+            capacity: Maximum number of idle shells kept for reuse
+        """
+        self._free: deque = deque(maxlen=capacity)
+
+    def acquire(self, **kwargs) -> Assessment:
+        """Return a recycled shell reinitialized with the given fields,
+        or a newly constructed Assessment when the freelist is empty."""
+        shell = self._free.pop() if self._free else None
+        if shell is None:
+            return Assessment(**kwargs)
+        shell._reset(**kwargs)
+        return shell
+
+    def release(self, assessment: Assessment):
+        """Return an evicted shell to the freelist for reuse.
+        Callers must not keep references to released shells."""
+        self._free.append(assessment)
+
 class RiskEngine:
     """
     Comprehensive risk assessment combining privacy and security risks.
@@ -17,9 +168,31 @@ class RiskEngine:
         self.risk_threshold_warning = 30
         self.risk_threshold_critical = 70
         self.risk_threshold_block = 85
-        self.risk_history = []
-    
-    def assess_request(self, 
+        # Per-dimension weights for the gamma aggregator; use
+        # set_dimension_weights to select a different weighting profile
+        # per deployment
+        self.dimension_weights = _RISK_WEIGHTS
+        self._combine = _compile_combine(_RISK_WEIGHTS)
+        # Bounded ring: appends past the cap evict the oldest entry in
+        # O(1) instead of rebuilding the list with a slice
+        self.risk_history = deque(maxlen=1000)
+        # Running tallies kept in step with the history so statistics
+        # never require a pass over stored assessments
+        self._stats = {"count": 0, "sum": 0.0, "actions": Counter()}
+        # Evicted record shells are recycled through here
+        self._pool = _AssessmentPool()
+
+    def set_dimension_weights(self, weights) -> None:
+        """
+        Select a weighting profile and respecialize the combiner.
+
+        Args:
+            weights: Per-dimension weights (privacy, security)
+        """
+        self.dimension_weights = np.asarray(weights, dtype=np.float64)
+        self._combine = _compile_combine(self.dimension_weights)
+
+    def assess_request(self,
                       request_id: str,
                       content: str,
                       operation: str = None,
@@ -36,72 +209,195 @@ class RiskEngine:
         Returns:
             Risk assessment report
         """
+        # One clock read serves this assessment and every sub-scan
+        now_iso = datetime.now().isoformat()
+
         # Privacy check
-        privacy_scan = self.privacy_checker.scan_text(content)
+        privacy_scan = self.privacy_checker.scan_text(content, _now_iso=now_iso)
         privacy_risk = privacy_scan["risk_score"]
-        
+
         # Security check
         security_report = self.security_scanner.get_security_report(
             text=content,
             operation=operation,
-            params=params
+            params=params,
+            _now_iso=now_iso
         )
         security_risk = security_report["overall_risk_score"]
         
-        # Calculate combined risk
-        combined_risk = (privacy_risk * 0.4) + (security_risk * 0.6)
-        combined_risk = min(combined_risk, 100)
+        # Gamma aggregator: weighted mean of the normalized dimension
+        # scores, plus a weighted variance that separates risk
+        # concentrated in one dimension from risk spread across all.
+        # The combiner is codegen-specialized for the active weight
+        # profile; with the default 0.4/0.6 weights gamma_norm equals
+        # the old two-term expression
+        gamma, gamma_norm, sigma2 = self._combine(privacy_risk, security_risk)
+        c_conc = 200.0 * math.sqrt(sigma2)
+        combined_risk = min(gamma_norm, 100.0)
         
         # Determine action
         if combined_risk >= self.risk_threshold_block:
             action = "BLOCK"
-            reason = "Risk score exceeds critical threshold"
         elif combined_risk >= self.risk_threshold_critical:
             action = "ESCALATE"
-            reason = "High risk - requires supervisor review"
         elif combined_risk >= self.risk_threshold_warning:
             action = "ALLOW_WITH_LOGGING"
-            reason = "Elevated risk - monitor and log"
         else:
             action = "ALLOW"
-            reason = "Risk within acceptable limits"
+        reason = _ACTION_REASONS[action]
         
-        assessment = {
-            "request_id": request_id,
-            "timestamp": datetime.now().isoformat(),
-            "risk_score": round(combined_risk, 1),
-            "risk_components": {
+        assessment = self._pool.acquire(
+            request_id=request_id,
+            timestamp=now_iso,
+            risk_score=round(combined_risk, 1),
+            risk_components={
                 "privacy_risk": privacy_risk,
-                "security_risk": security_risk
+                "security_risk": security_risk,
+                "gamma": round(gamma, 4),
+                "gamma_norm": round(gamma_norm, 1),
+                "sigma2": round(sigma2, 4),
+                "concentration": round(c_conc, 1)
             },
-            "privacy_findings": privacy_scan["findings"],
-            "security_findings": security_report["scans"].get("text_scan", {}).get("findings", []),
-            "action": action,
-            "reason": reason,
-            "approved": action != "BLOCK"
-        }
-        
-        # Store in history
-        self.risk_history.append(assessment)
-        
-        # Keep only last 1000 assessments
-        if len(self.risk_history) > 1000:
-            self.risk_history = self.risk_history[-1000:]
-        
-        return assessment
+            privacy_findings=privacy_scan["findings"],
+            security_findings=security_report["scans"].get(
+                "text_scan", {}).get("findings", []),
+            action=action,
+            reason=reason,
+            approved=action != "BLOCK"
+        )
+
+        self._record(assessment)
+
+        return assessment.to_dict()
+
+    def _record(self, assessment: Assessment) -> None:
+        """Store an assessment and fold it into the running tallies.
+
+        When the ring is full the deque drops its oldest entry on
+        append, so that entry is subtracted back out first.
+        """
+        history = self.risk_history
+        stats = self._stats
+        if len(history) == history.maxlen:
+            old = history[0]
+            stats["count"] -= 1
+            stats["sum"] -= old.risk_score
+            stats["actions"][old.action] -= 1
+            # The deque is about to drop this reference; recycle the
+            # shell instead of leaving it to the collector
+            self._pool.release(old)
+        history.append(assessment)
+        stats["count"] += 1
+        stats["sum"] += assessment.risk_score
+        stats["actions"][assessment.action] += 1
+
+    def assess_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Assess many requests, aggregating scores in one vectorized pass.
+
+        The per-request scans still run individually (they are regex
+        bound), but combining, capping, and thresholding the scores
+        happens as array operations instead of per-item Python
+        arithmetic.
+
+        Args:
+            requests: Dicts with request_id and content, plus optional
+                operation and params, as accepted by assess_request
+
+        Returns:
+            List of assessment reports in input order
+        """
+        if not requests:
+            return []
+
+        now_iso = datetime.now().isoformat()
+        privacy_scans = []
+        security_reports = []
+        for req in requests:
+            privacy_scans.append(
+                self.privacy_checker.scan_text(req["content"], _now_iso=now_iso)
+            )
+            security_reports.append(
+                self.security_scanner.get_security_report(
+                    text=req["content"],
+                    operation=req.get("operation"),
+                    params=req.get("params"),
+                    _now_iso=now_iso,
+                )
+            )
+
+        # (N, 2) normalized component matrix through the gamma
+        # aggregator in one vectorized pass (see assess_request)
+        u = np.asarray(self.dimension_weights, dtype=np.float64)
+        u_sum = float(u.sum())
+        s = np.array(
+            [
+                [p["risk_score"], r["overall_risk_score"]]
+                for p, r in zip(privacy_scans, security_reports)
+            ],
+            dtype=np.float64,
+        ) / 100.0
+        gamma = s @ u
+        gamma_norm = 100.0 * gamma / u_sum
+        s_bar = gamma / u_sum
+        sigma2 = (u * (s - s_bar[:, None]) ** 2).sum(axis=1) / u_sum
+        c_conc = 200.0 * np.sqrt(sigma2)
+        combined = np.minimum(gamma_norm, 100.0)
+        actions = np.select(
+            [
+                combined >= self.risk_threshold_block,
+                combined >= self.risk_threshold_critical,
+                combined >= self.risk_threshold_warning,
+            ],
+            ["BLOCK", "ESCALATE", "ALLOW_WITH_LOGGING"],
+            default="ALLOW",
+        )
+
+        assessments = []
+        for i, req in enumerate(requests):
+            action = str(actions[i])
+            assessment = self._pool.acquire(
+                request_id=req["request_id"],
+                timestamp=now_iso,
+                risk_score=round(float(combined[i]), 1),
+                risk_components={
+                    "privacy_risk": privacy_scans[i]["risk_score"],
+                    "security_risk": security_reports[i]["overall_risk_score"],
+                    "gamma": round(float(gamma[i]), 4),
+                    "gamma_norm": round(float(gamma_norm[i]), 1),
+                    "sigma2": round(float(sigma2[i]), 4),
+                    "concentration": round(float(c_conc[i]), 1)
+                },
+                privacy_findings=privacy_scans[i]["findings"],
+                security_findings=security_reports[i]["scans"].get(
+                    "text_scan", {}).get("findings", []),
+                action=action,
+                reason=_ACTION_REASONS[action],
+                approved=action != "BLOCK"
+            )
+            self._record(assessment)
+            assessments.append(assessment.to_dict())
+
+        return assessments
     
     def get_risk_statistics(self) -> Dict[str, Any]:
-        """Get statistics on risk assessments."""
-        if not self.risk_history:
+        """Get statistics on risk assessments.
+
+        Reads the running tallies maintained by assess_request, so the
+        cost is constant regardless of history size.
+        """
+        stats = self._stats
+        total = stats["count"]
+        if not total:
             return {"message": "No risk assessments yet"}
-        
-        total = len(self.risk_history)
-        blocked = sum(1 for r in self.risk_history if r["action"] == "BLOCK")
-        escalated = sum(1 for r in self.risk_history if r["action"] == "ESCALATE")
-        allowed = sum(1 for r in self.risk_history if r["action"] == "ALLOW")
-        
-        avg_risk = sum(r["risk_score"] for r in self.risk_history) / total
-        
+
+        actions = stats["actions"]
+        blocked = actions["BLOCK"]
+        escalated = actions["ESCALATE"]
+        allowed = actions["ALLOW"]
+
+        avg_risk = stats["sum"] / total
+
         return {
             "total_assessments": total,
             "blocked": blocked,
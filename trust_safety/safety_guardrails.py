@@ -32,8 +32,25 @@ class SafetyGuardrails:
             "delete_backup", "disable_monitoring", "export_all_data"
         ]
         
+        # One lookup table replaces three membership scans per
+        # classification; keys are normalized to lowercase at insert so
+        # the hot path can look actions up as-is, and dangerous entries
+        # are written last so they win if an action ever appears in
+        # more than one list
+        self._category_map: Dict[str, ActionCategory] = {}
+        for action in self.safe_actions:
+            self._category_map[action.lower()] = ActionCategory.SAFE
+        for action in self.review_actions:
+            self._category_map[action.lower()] = ActionCategory.REVIEW
+        for action in self.dangerous_actions:
+            self._category_map[action.lower()] = ActionCategory.BLOCK
+
         self.audit_log: List[Dict[str, Any]] = []
         self.blocked_actions: List[Dict[str, Any]] = []
+        # action_id -> evaluation, so approval lookups skip the scan
+        # over the audit log; approval entries are logged but not
+        # indexed, since approvals reference the original evaluation
+        self._audit_index: Dict[str, Dict[str, Any]] = {}
     
     def classify_action(self, action: str) -> ActionCategory:
         """
@@ -45,17 +62,15 @@ class SafetyGuardrails:
         Returns:
             ActionCategory
         """
-        action_lower = action.lower()
-        
-        if action_lower in self.dangerous_actions:
-            return ActionCategory.BLOCK
-        elif action_lower in self.review_actions:
-            return ActionCategory.REVIEW
-        elif action_lower in self.safe_actions:
-            return ActionCategory.SAFE
-        else:
-            # Unknown action - err on side of caution
-            return ActionCategory.REVIEW
+        # Callers overwhelmingly pass canonical lowercase names, so try
+        # the string as-is first and only pay for .lower() on a miss;
+        # unknown actions err on the side of caution
+        category = self._category_map.get(action)
+        if category is None:
+            category = self._category_map.get(
+                action.lower(), ActionCategory.REVIEW
+            )
+        return category
     
     def evaluate_action(self, 
                        agent_id: str,
@@ -73,13 +88,15 @@ class SafetyGuardrails:
             Evaluation result
         """
         category = self.classify_action(action)
-        
+
+        # One clock read serves both the id and the timestamp
+        now = datetime.now()
         evaluation = {
-            "action_id": f"act_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            "action_id": f"act_{now.strftime('%Y%m%d_%H%M%S')}",
             "agent_id": agent_id,
             "action": action,
             "category": category.value,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "allowed": category != ActionCategory.BLOCK,
             "requires_approval": category == ActionCategory.REVIEW or category == ActionCategory.BLOCK,
             "reason": self._get_action_reason(category),
@@ -88,6 +105,7 @@ class SafetyGuardrails:
         
         # Log action
         self.audit_log.append(evaluation)
+        self._audit_index[evaluation["action_id"]] = evaluation
         
         # Track blocked actions
         if not evaluation["allowed"]:
@@ -121,13 +139,8 @@ class SafetyGuardrails:
         Returns:
             Approval result
         """
-        # Find action in audit log
-        action = None
-        for log_entry in self.audit_log:
-            if log_entry["action_id"] == action_id:
-                action = log_entry
-                break
-        
+        action = self._audit_index.get(action_id)
+
         if not action:
             return {"error": "Action not found"}
         
@@ -1,4 +1,5 @@
 from typing import Dict, Any, Optional, List
+from collections import Counter
 from datetime import datetime
 from enum import Enum
 
@@ -17,8 +18,23 @@ class SupervisorRepairBrain:
     
     def __init__(self):
         """Initialize supervisor repair brain."""
-        self.failure_history: List[Dict[str, Any]] = []
+        # Failure records stored column-wise (SoA): history statistics
+        # read one flat list or the reason counter instead of chasing a
+        # dict per record
+        self._f_id: List[str] = []
+        self._f_agent: List[str] = []
+        self._f_task: List[str] = []
+        self._f_reason: List[str] = []
+        self._f_metrics: List[Dict[str, float]] = []
+        self._f_timestamp: List[str] = []
+        self._f_severity: List[str] = []
+        # reason -> occurrence count, maintained on detection so the
+        # distinct failure types are available without a set build
+        self._reason_counter: Counter = Counter()
         self.repair_attempts: List[Dict[str, Any]] = []
+        # repair_id -> plan, so step execution is a lookup rather than a
+        # scan over every attempt ever made
+        self._repair_index: Dict[str, Dict[str, Any]] = {}
         self.max_retry_attempts = 3
         self.repair_strategies = [
             RepairStrategy.PROMPT_ADJUSTMENT,
@@ -44,19 +60,28 @@ class SupervisorRepairBrain:
         Returns:
             Failure detection report
         """
+        # One clock read serves both the id and the timestamp
+        now = datetime.now()
         failure = {
-            "failure_id": f"fail_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            "failure_id": f"fail_{now.strftime('%Y%m%d_%H%M%S')}",
             "agent_id": agent_id,
             "task_id": task_id,
             "reason": failure_reason,
             "metrics": metrics or {},
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "severity": self._assess_severity(failure_reason, metrics),
             "repair_required": True
         }
-        
-        self.failure_history.append(failure)
-        
+
+        self._f_id.append(failure["failure_id"])
+        self._f_agent.append(agent_id)
+        self._f_task.append(task_id)
+        self._f_reason.append(failure_reason)
+        self._f_metrics.append(failure["metrics"])
+        self._f_timestamp.append(failure["timestamp"])
+        self._f_severity.append(failure["severity"])
+        self._reason_counter[failure_reason] += 1
+
         return failure
     
     def _assess_severity(self, reason: str, metrics: Dict[str, float] = None) -> str:
@@ -125,7 +150,8 @@ class SupervisorRepairBrain:
         ]
         
         self.repair_attempts.append(repair_plan)
-        
+        self._repair_index[repair_plan["repair_id"]] = repair_plan
+
         return repair_plan
     
     def execute_repair_step(self, repair_id: str, strategy_index: int) -> Dict[str, Any]:
@@ -139,13 +165,8 @@ class SupervisorRepairBrain:
         Returns:
             Repair step result
         """
-        # Find repair plan
-        repair_plan = None
-        for plan in self.repair_attempts:
-            if plan["repair_id"] == repair_id:
-                repair_plan = plan
-                break
-        
+        repair_plan = self._repair_index.get(repair_id)
+
         if not repair_plan:
             return {"error": "Repair plan not found"}
         
@@ -185,16 +206,35 @@ class SupervisorRepairBrain:
     def get_repair_history(self) -> Dict[str, Any]:
         """Get repair history and statistics."""
         successful_repairs = sum(
-            1 for r in self.repair_attempts 
+            1 for r in self.repair_attempts
             if "success" in r.get("status", "").lower()
         )
-        
+
+        # Recent records are rebuilt from the column tails; the full
+        # dict shape only exists for the five entries actually returned
+        recent_failures = [
+            {
+                "failure_id": fid,
+                "agent_id": agent,
+                "task_id": task,
+                "reason": reason,
+                "metrics": metrics,
+                "timestamp": timestamp,
+                "severity": severity,
+                "repair_required": True
+            }
+            for fid, agent, task, reason, metrics, timestamp, severity
+            in zip(self._f_id[-5:], self._f_agent[-5:], self._f_task[-5:],
+                   self._f_reason[-5:], self._f_metrics[-5:],
+                   self._f_timestamp[-5:], self._f_severity[-5:])
+        ]
+
         return {
-            "total_failures": len(self.failure_history),
+            "total_failures": len(self._f_id),
             "repair_attempts": len(self.repair_attempts),
             "successful_repairs": successful_repairs,
-            "failure_types": list(set(f["reason"] for f in self.failure_history)),
-            "recent_failures": self.failure_history[-5:] if self.failure_history else []
+            "failure_types": list(self._reason_counter),
+            "recent_failures": recent_failures
         }
 
 